@@ -1,3 +1,4 @@
+import json
 import sys
 import aqt
 from aqt import mw, gui_hooks
@@ -5,7 +6,7 @@ from aqt.qt import *
 
 from .panel import CustomTitleBar, OpenEvidencePanel, OnboardingWidget
 from .utils import clean_html_text
-from .reviewer_highlight import setup_highlight_hooks
+from .reviewer_highlight import setup_highlight_hooks, invalidate_config_cache
 from .analytics import init_analytics, try_send_daily_analytics, track_add_to_chat, track_ask_question, track_anki_open
 
 from .analytics import init_analytics, try_send_daily_analytics, track_add_to_chat, track_ask_question, track_anki_open
@@ -58,6 +59,7 @@ def ensure_platform_defaults():
                 "ask_question": {"keys": ["Control", "R"]}
             }
         mw.addonManager.writeConfig(ADDON_NAME, config)
+        invalidate_config_cache()
         print(f"OpenEvidence: Set platform-appropriate quick action defaults for {'Mac' if IS_MAC else 'Windows/Linux'}")
 
 
@@ -179,45 +181,39 @@ def on_webview_did_receive_js_message(handled, message, context):
             pass
         return (True, None)
 
-    # Handle highlight bubble messages
-    if message.startswith("openevidence:add_context:"):
-        # Extract the selected text
-        selected_text = message.replace("openevidence:add_context:", "", 1)
+    # Handle highlight bubble messages (a JSON envelope after the prefix)
+    if message.startswith("openevidence:{"):
         try:
-            from urllib.parse import unquote
-            selected_text = unquote(selected_text)
-        except:
-            pass
-        handle_add_context(selected_text)
-
-        # Notify tutorial that text was highlighted
-        try:
-            from .tutorial import tutorial_event
-            tutorial_event("text_highlighted")
-        except:
-            pass
+            payload = json.loads(message.replace("openevidence:", "", 1))
+        except (ValueError, TypeError):
+            return (True, None)
+        # Malformed payloads and unknown ops are still ours, so they're
+        # consumed here instead of reaching other handlers
+        op = payload.get("op") if isinstance(payload, dict) else None
+
+        if op == "add_context":
+            handle_add_context(payload.get("text", ""))
+
+            # Notify tutorial that text was highlighted
+            try:
+                from .tutorial import tutorial_event
+                tutorial_event("text_highlighted")
+            except:
+                pass
+
+        elif op == "ask_query":
+            try:
+                handle_ask_query(payload.get("query", ""), payload.get("context", ""))
 
-        return (True, None)
-
-    if message.startswith("openevidence:ask_query:"):
-        # Extract query and context
-        data = message.replace("openevidence:ask_query:", "", 1)
-        try:
-            from urllib.parse import unquote
-            parts = data.split("|", 1)
-            if len(parts) == 2:
-                query = unquote(parts[0])
-                context = unquote(parts[1])
-                handle_ask_query(query, context)
-                
                 # Notify tutorial that a question was submitted
                 try:
                     from .tutorial import tutorial_event
                     tutorial_event("ask_question_submitted")
                 except:
                     pass
-        except:
-            pass
+            except:
+                pass
+
         return (True, None)
 
     return handled
@@ -25,8 +25,19 @@ def get_analytics_data() -> Dict:
 def save_analytics_data(analytics: Dict):
     """Save analytics data to config."""
     config = mw.addonManager.getConfig(ADDON_NAME) or {}
+    previous = config.get("analytics", {})
     config["analytics"] = analytics
     mw.addonManager.writeConfig(ADDON_NAME, config)
+    # A cached review eligibility result is only stale if a value it
+    # reads changed
+    from .review import invalidate_review_eligibility
+    invalidate_review_eligibility(config, previous)
+
+
+def _count_new_active_day(analytics: Dict, daily_usage: Dict, today: str):
+    """Bump the cached days-active count when today is a new entry in daily_usage."""
+    if today not in daily_usage:
+        analytics["days_active_count"] = analytics.get("days_active_count", len(daily_usage)) + 1
 
 
 def init_analytics():
@@ -75,6 +86,7 @@ def init_analytics():
         analytics["daily_usage"] = {
             today: [{"time": current_time, "messages": 0}]
         }
+        analytics["days_active_count"] = 1
         _current_session_index = 0
 
         save_analytics_data(analytics)
@@ -216,6 +228,7 @@ def track_message_sent():
         else:
             # No sessions today - create one
             current_time = datetime.now().strftime("%H:%M:%S")
+            _count_new_active_day(analytics, daily_usage, today)
             todays_sessions.append({"time": current_time, "messages": 0})
             _current_session_index = 0
             daily_usage[today] = todays_sessions
@@ -250,6 +263,7 @@ def track_anki_open():
     new_session = {"time": current_time, "messages": 0}
     todays_sessions.append(new_session)
     
+    _count_new_active_day(analytics, daily_usage, today)
     daily_usage[today] = todays_sessions
     analytics["daily_usage"] = daily_usage
     
@@ -275,6 +289,7 @@ def cleanup_old_daily_data(analytics: Dict):
         for date, count in daily_usage.items()
         if date >= cutoff_str
     }
+    analytics["days_active_count"] = len(analytics["daily_usage"])
 
 
 def get_locale_info() -> Dict:
@@ -38,7 +38,6 @@ except ImportError:
             QWebEnginePage = None
             QWebEngineProfile = None
 
-from .settings import SettingsHomeView, SettingsListView, SettingsEditorView
 from .theme_manager import ThemeManager
 import os
 
@@ -459,6 +458,7 @@ class OpenEvidencePanel(QWidget):
         self.web.load(QUrl("https://www.openevidence.com/"))
 
         # Create settings home view (main settings hub)
+        from .settings import SettingsHomeView
         self.settings_view = SettingsHomeView(self)
 
         # Add views to stacked widget
@@ -767,6 +767,7 @@ class OpenEvidencePanel(QWidget):
 
     def show_editor_view(self, keybinding, index):
         """Show the settings editor view"""
+        from .settings import SettingsEditorView
         editor_view = SettingsEditorView(self, keybinding, index)
         # Remove settings list and add editor
         old_settings = self.settings_view
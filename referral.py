@@ -3,7 +3,7 @@ Good Karma Referral Modal - "Shadow Tracking" implementation.
 Shows to verified returning users (2+ days active, 2nd message of the day).
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from aqt import mw
 
 try:
@@ -57,13 +57,13 @@ def should_show_referral() -> bool:
     
     # Check days active
     daily_usage = analytics.get("daily_usage", {})
-    days_active = len(daily_usage.keys())
+    days_active = analytics.get("days_active_count", len(daily_usage))
     
     if days_active < config.get("referral_days_threshold", 3):
         return False
     
     # Check messages today
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = date.today().isoformat()
     todays_sessions = daily_usage.get(today, [])
     
     # Sum all messages across today's sessions
@@ -85,6 +85,9 @@ def mark_referral_shown():
     analytics["referral_shown_date"] = datetime.now().isoformat()
     config["analytics"] = analytics
     mw.addonManager.writeConfig(ADDON_NAME, config)
+    # Review eligibility depends on the referral having been shown
+    from .review import invalidate_review_eligibility
+    invalidate_review_eligibility()
 
 
 def track_referral_modal(status: str, seconds_open: float):
@@ -3,17 +3,20 @@ Review Request Modal - Shows after referral modal to ask for AnkiWeb review.
 Similar structure to referral.py but with different copy and destination.
 """
 
-from datetime import datetime
-from aqt import mw
+import html
+import webbrowser
+from datetime import date, datetime
+from typing import Optional
+from aqt import mw, gui_hooks
 
 try:
     from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGraphicsDropShadowEffect
-    from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QEasingCurve
-    from PyQt6.QtGui import QCursor, QColor
+    from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QPoint, QEasingCurve, QEvent
+    from PyQt6.QtGui import QCursor, QColor, QPainter
 except ImportError:
     from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGraphicsDropShadowEffect
-    from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QEasingCurve
-    from PyQt5.QtGui import QCursor, QColor
+    from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QPoint, QEasingCurve, QEvent
+    from PyQt5.QtGui import QCursor, QColor, QPainter
 
 from .utils import ADDON_NAME
 from .theme_manager import ThemeManager
@@ -21,6 +24,84 @@ from .theme_manager import ThemeManager
 # AnkiWeb review page for the addon
 REVIEW_URL = "https://ankiweb.net/shared/review/1314683963"
 
+# Typing phases; each phase's paragraph style sits at the same index
+_PHASE_ORDER = ("phase1", "phase2", "main", "motivation", "please", "final")
+
+# Height each phase's label used to reserve (phase1 reserved none)
+_PHASE_MIN_HEIGHTS = (0, 50, 60, 40, 50, 50)
+
+# All text phases, in order: (phase index, text, should_delete)
+_TYPING_SCRIPT = (
+    (0, "I know... Not this shit again.", True),
+    (1, "I swear this is the last time I do this", True),
+    (2, "So..... this add on took me fucking forever to build and I am updating it constantly.", False),
+    (3, "The main way I stay motivated is if you do this", False),
+    (4, "So.... Can you please and I mean pretty please with a giant cherry on top.", False),
+    (5, "Leave a positive review on Anki about this add on. You are my only Hope.", False),
+)
+
+# Height reserved for the text label: the phases still shown at the end.
+# Deleted phases were never on screen alongside them, so they don't add to it.
+_TEXT_MIN_HEIGHT = sum(_PHASE_MIN_HEIGHTS[phase] for phase, _, delete in _TYPING_SCRIPT if not delete)
+
+# Typewriter script step kinds
+STEP_TYPE, STEP_RELAYOUT, STEP_COMMIT, STEP_DONE = range(4)
+
+# Debounced analytics writes: updates accumulate here and are flushed
+# to the config in a single writeConfig call
+FLUSH_DELAY_MS = 500
+_pending_analytics = {}
+_dirty = False
+_flush_timer = None
+
+# Session-level eligibility latch (see should_show_review)
+_evaluated_this_session = False
+_result_this_session: Optional[bool] = None
+_permanently_ineligible = False
+
+
+def _flush():
+    """Write any pending analytics updates to the config in one shot."""
+    global _dirty
+    if not _dirty:
+        return
+    # Re-read once per batch so fields written by analytics.py in the
+    # meantime (daily_usage etc.) aren't overwritten by a stale copy
+    config = mw.addonManager.getConfig(ADDON_NAME) or {}
+    config.setdefault("analytics", {}).update(_pending_analytics)
+    mw.addonManager.writeConfig(ADDON_NAME, config)
+    _pending_analytics.clear()
+    _dirty = False
+
+
+def _mark_dirty():
+    """Schedule a flush, restarting the debounce window."""
+    global _dirty, _flush_timer
+    _dirty = True
+    if _flush_timer is None:
+        _flush_timer = QTimer()
+        _flush_timer.setSingleShot(True)
+        _flush_timer.setInterval(FLUSH_DELAY_MS)
+        _flush_timer.timeout.connect(_flush)
+        # Don't lose pending state if Anki closes inside the debounce window
+        gui_hooks.profile_will_close.append(_flush)
+    _flush_timer.start()
+
+
+def invalidate_review_eligibility(config=None, previous_analytics=None):
+    """Forget a cached transient eligibility result (call after analytics change).
+
+    Given the config just written and the analytics it replaced, the result is
+    only dropped if a value the eligibility check reads has changed.
+    """
+    global _evaluated_this_session
+    if _permanently_ineligible or not _evaluated_this_session:
+        return
+    if config is not None and previous_analytics is not None:
+        if _eligibility_inputs(config, previous_analytics) == _eligibility_inputs(config, config.get("analytics", {})):
+            return
+    _evaluated_this_session = False
+
 
 def should_show_review() -> bool:
     """
@@ -30,35 +111,56 @@ def should_show_review() -> bool:
     2. Review modal not yet shown (!has_shown_review)
     3. Days active >= review_days_threshold (default: 7)
     4. Messages today >= review_message_threshold (default: 3)
+    
+    The result is latched for the session: for good once the review has been
+    shown, otherwise until invalidate_review_eligibility() is called.
     """
+    global _evaluated_this_session, _result_this_session
+    if not _evaluated_this_session:
+        _result_this_session = _evaluate_review_eligibility()
+        _evaluated_this_session = True
+    return _result_this_session
+
+
+def _eligibility_inputs(config, analytics):
+    """The analytics values the eligibility check reads, as a comparable tuple.
+
+    Today's message count is capped at the threshold, since messages past it
+    can't change the result.
+    """
+    daily_usage = analytics.get("daily_usage", {})
+    todays_sessions = daily_usage.get(date.today().isoformat(), [])
+    messages_today = sum(session.get("messages", 0) for session in todays_sessions)
+    return (
+        analytics.get("has_shown_referral", False),
+        analytics.get("has_shown_review", False),
+        analytics.get("days_active_count", len(daily_usage)),
+        min(messages_today, config.get("review_message_threshold", 3)),
+    )
+
+
+def _evaluate_review_eligibility() -> bool:
+    """Run the full eligibility check against the current config."""
+    global _permanently_ineligible
     config = mw.addonManager.getConfig(ADDON_NAME) or {}
-    analytics = config.get("analytics", {})
+    analytics = {**config.get("analytics", {}), **_pending_analytics}
+    has_shown_referral, has_shown_review, days_active, messages_today = _eligibility_inputs(config, analytics)
     
     # Must have seen referral first
-    if not analytics.get("has_shown_referral", False):
+    if not has_shown_referral:
         return False
     
     # Check if already shown review
-    if analytics.get("has_shown_review", False):
+    if has_shown_review:
+        _permanently_ineligible = True
         return False
     
     # Check days active
-    daily_usage = analytics.get("daily_usage", {})
-    days_active = len(daily_usage.keys())
-    
     if days_active < config.get("review_days_threshold", 8):
         return False
     
-    # Check messages today
-    today = datetime.now().strftime("%Y-%m-%d")
-    todays_sessions = daily_usage.get(today, [])
-    
-    # Sum all messages across today's sessions
-    messages_today = sum(session.get("messages", 0) for session in todays_sessions)
-    
     # Trigger on message count threshold
-    review_threshold = config.get("review_message_threshold", 3)
-    if messages_today < review_threshold:
+    if messages_today < config.get("review_message_threshold", 3):
         return False
     
     return True
@@ -66,12 +168,13 @@ def should_show_review() -> bool:
 
 def mark_review_shown():
     """Mark that the review modal has been shown."""
-    config = mw.addonManager.getConfig(ADDON_NAME) or {}
-    analytics = config.get("analytics", {})
-    analytics["has_shown_review"] = True
-    analytics["review_shown_date"] = datetime.now().isoformat()
-    config["analytics"] = analytics
-    mw.addonManager.writeConfig(ADDON_NAME, config)
+    global _evaluated_this_session, _result_this_session, _permanently_ineligible
+    _evaluated_this_session = True
+    _result_this_session = False
+    _permanently_ineligible = True
+    _pending_analytics["has_shown_review"] = True
+    _pending_analytics["review_shown_date"] = datetime.now().isoformat()
+    _mark_dirty()
 
 
 def track_review_modal(status: str, seconds_open: float):
@@ -83,15 +186,96 @@ def track_review_modal(status: str, seconds_open: float):
     - "explicit_reject": Clicked skip button
     - "ignored_quickly": Closed in < 10 seconds without action
     """
-    config = mw.addonManager.getConfig(ADDON_NAME) or {}
-    analytics = config.get("analytics", {})
-    analytics["review_modal_status"] = status
-    analytics["review_modal_seconds_open"] = round(seconds_open, 1)
-    config["analytics"] = analytics
-    mw.addonManager.writeConfig(ADDON_NAME, config)
+    _pending_analytics["review_modal_status"] = status
+    _pending_analytics["review_modal_seconds_open"] = round(seconds_open, 1)
+    _mark_dirty()
     print(f"AI Panel: Review modal tracked - {status} ({seconds_open:.1f}s)")
 
 
+# Composed overlay stylesheets, keyed by theme id
+_QSS_CACHE = {}
+
+# Overlay background colors, keyed by theme id
+_BG_QCOLOR_CACHE = {}
+
+_HAND_CURSOR = QCursor(Qt.CursorShape.PointingHandCursor)
+
+
+def _get_bg_qcolor(theme_id):
+    """Get the overlay background QColor for a theme, building it on first use."""
+    color = _BG_QCOLOR_CACHE.get(theme_id)
+    if color is None:
+        color = _BG_QCOLOR_CACHE[theme_id] = ThemeManager.get_qcolor('background')
+    return color
+
+
+def _get_stylesheets(theme_id):
+    """Get the overlay stylesheets for a theme, building them on first use."""
+    cached = _QSS_CACHE.get(theme_id)
+    if cached is not None:
+        return cached
+
+    c = ThemeManager.get_palette()
+    cached = {
+        "overlay": f"""
+            QWidget {{
+                background: {c['background']};
+            }}
+            QLabel {{
+                color: {c['text']};
+                background: transparent;
+            }}
+        """,
+        "text_label": """
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+            background: transparent;
+        """,
+        # Inline paragraph styles for each typing phase, in _PHASE_ORDER
+        "phases": (
+            f"font-size: 16px; font-weight: 500; color: {c['text_secondary']}; margin-bottom: 10px;",
+            f"font-size: 16px; font-weight: 500; color: {c['text_secondary']}; margin-bottom: 10px;",
+            f"font-size: 15px; font-weight: 600; color: {c['text']}; margin-bottom: 10px;",
+            f"font-size: 14px; color: {c['text_secondary']}; margin-bottom: 10px;",
+            f"font-size: 14px; color: {c['text_secondary']}; margin-bottom: 10px;",
+            f"font-size: 16px; font-weight: 700; color: {c['text']}; margin-bottom: 10px;",
+        ),
+        "star": f"font-size: 18px; background: transparent;",
+        "text": f"""
+            font-size: 15px;
+            font-weight: 500;
+            color: {c['text']};
+            background: transparent;
+        """,
+        "arrow": f"font-size: 14px; color: {c['text_secondary']}; background: transparent;",
+        "review_btn": f"""
+            QPushButton {{
+                background: {c['surface']};
+                border: 1px solid {c['border']};
+                border-radius: 10px;
+                min-height: 48px;
+            }}
+            QPushButton:hover {{
+                background: {c['hover']};
+                border-color: {c['text_secondary']};
+            }}
+        """,
+        "skip_btn": f"""
+            QPushButton {{
+                background: transparent;
+                color: {c['text_secondary']};
+                border: none;
+                font-size: 11px;
+                padding: 8px;
+            }}
+            QPushButton:hover {{
+                color: {c['text_secondary']};
+            }}
+        """,
+    }
+    _QSS_CACHE[theme_id] = cached
+    return cached
+
+
 class ReviewOverlay(QWidget):
     """Review request overlay that covers the panel content."""
     
@@ -99,10 +283,16 @@ class ReviewOverlay(QWidget):
         super().__init__(parent)
         self.open_time = datetime.now()
         self.animation = None
-        self._bg_color = ThemeManager.get_qcolor('background')
+        self._reduced_motion = (mw.addonManager.getConfig(ADDON_NAME) or {}).get("review_reduced_motion", False)
+        self._bg_color = _get_bg_qcolor(ThemeManager.current_theme_id())
         
         self.setAutoFillBackground(True)
         
+        # One timer drives the whole typing script; parented so it dies with the overlay
+        self.typing_timer = QTimer(self)
+        self.typing_timer.setSingleShot(True)
+        self.typing_timer.timeout.connect(self._advance)
+        
         if parent:
             parent.installEventFilter(self)
         
@@ -110,22 +300,12 @@ class ReviewOverlay(QWidget):
     
     def eventFilter(self, watched, event):
         """Resize overlay when parent is resized."""
-        try:
-            from PyQt6.QtCore import QEvent
-        except ImportError:
-            from PyQt5.QtCore import QEvent
-        
         if watched == self.parent() and event.type() == QEvent.Type.Resize:
             self.setGeometry(self.parent().rect())
         return super().eventFilter(watched, event)
         
     def paintEvent(self, event):
         """Override paint to guarantee solid dark background."""
-        try:
-            from PyQt6.QtGui import QPainter
-        except ImportError:
-            from PyQt5.QtGui import QPainter
-        
         painter = QPainter(self)
         painter.fillRect(self.rect(), self._bg_color)
         painter.end()
@@ -135,47 +315,46 @@ class ReviewOverlay(QWidget):
         """Animate slide down when shown."""
         super().showEvent(event)
         self.animate_entry()
+        # Resume a typing script that was paused while hidden
+        if getattr(self, "_script", None) and self._step < len(self._script) and not self.typing_timer.isActive():
+            self.typing_timer.start(0)
+    
+    def hideEvent(self, event):
+        """Stop all animation work while the overlay isn't visible."""
+        self.typing_timer.stop()
+        if self.animation:
+            self.animation.stop()
+        super().hideEvent(event)
 
     def animate_entry(self):
         """Animate the overlay sliding down from the top."""
-        try:
-            from PyQt6.QtCore import QPropertyAnimation, QRect, QEasingCurve
-        except ImportError:
-            from PyQt5.QtCore import QPropertyAnimation, QRect, QEasingCurve
-            
         parent = self.parent()
         if not parent:
             return
             
         end_rect = parent.rect()
-        start_rect = QRect(end_rect.x(), -end_rect.height(), end_rect.width(), end_rect.height())
+        # Size is fixed up front; only the position animates, so children
+        # don't re-layout on every frame
+        self.setGeometry(end_rect)
+        if self._reduced_motion:
+            return
         
-        self.setGeometry(start_rect)
+        start_pos = QPoint(end_rect.x(), -end_rect.height())
+        end_pos = end_rect.topLeft()
+        self.move(start_pos)
         
-        self.animation = QPropertyAnimation(self, b"geometry")
+        self.animation = QPropertyAnimation(self, b"pos")
         self.animation.setDuration(1600)
-        self.animation.setStartValue(start_rect)
-        self.animation.setEndValue(end_rect)
+        self.animation.setStartValue(start_pos)
+        self.animation.setEndValue(end_pos)
         self.animation.setEasingCurve(QEasingCurve.Type.OutExpo)
         self.animation.start()
         
     def setup_ui(self):
-        c = ThemeManager.get_palette()
-        self.setStyleSheet(f"""
-            QWidget {{
-                background: {c['background']};
-            }}
-            QLabel {{
-                color: {c['text']};
-                background: transparent;
-            }}
-        """)
+        qss = _get_stylesheets(ThemeManager.current_theme_id())
+        self.setStyleSheet(qss["overlay"])
         
         self.exit_method = None
-        self.typing_index = 0
-        self.current_text = ""
-        self.is_deleting = False
-        self.current_phase = 0
         
         # Main layout
         main_layout = QVBoxLayout(self)
@@ -193,94 +372,20 @@ class ReviewOverlay(QWidget):
         content_layout.setContentsMargins(28, 0, 28, 0)
         content_layout.setSpacing(0)
         
-        # === ANIMATED TEXT LABELS ===
-        # All labels need adjustSize() called when text changes to prevent cutoff
-        
-        # Phase 1 label (types then deletes) - "I know... Not this shit again."
-        self.phase1_label = QLabel("")
-        self.phase1_label.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: 500;
-            color: {c['text_secondary']};
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-            background: transparent;
-        """)
-        self.phase1_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-        self.phase1_label.setWordWrap(True)
-        self.phase1_label.setSizePolicy(self.phase1_label.sizePolicy().horizontalPolicy(), 
-                                         self.phase1_label.sizePolicy().verticalPolicy())
-        content_layout.addWidget(self.phase1_label)
-        
-        # Phase 2 label (types then deletes) - "I swear this is the last time..."
-        self.phase2_label = QLabel("")
-        self.phase2_label.setMinimumHeight(50)  # Allow for 2 lines
-        self.phase2_label.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: 500;
-            color: {c['text_secondary']};
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-            background: transparent;
-        """)
-        self.phase2_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-        self.phase2_label.setWordWrap(True)
-        self.phase2_label.hide()
-        content_layout.addWidget(self.phase2_label)
-        
-        # Main content label (stays visible) - "So..... this add on took me..."
-        self.main_label = QLabel("")
-        self.main_label.setMinimumHeight(60)  # Allow for 2-3 lines
-        self.main_label.setStyleSheet(f"""
-            font-size: 15px;
-            font-weight: 600;
-            color: {c['text']};
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-            background: transparent;
-        """)
-        self.main_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-        self.main_label.setWordWrap(True)
-        self.main_label.hide()
-        content_layout.addWidget(self.main_label)
-        
-        # Motivation label - "The main way I stay motivated..."
-        self.motivation_label = QLabel("")
-        self.motivation_label.setMinimumHeight(40)
-        self.motivation_label.setStyleSheet(f"""
-            font-size: 14px;
-            color: {c['text_secondary']};
-            background: transparent;
-        """)
-        self.motivation_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-        self.motivation_label.setWordWrap(True)
-        self.motivation_label.hide()
-        content_layout.addWidget(self.motivation_label)
-        
-        # Please label - "So.... Can you please..."
-        self.please_label = QLabel("")
-        self.please_label.setMinimumHeight(50)
-        self.please_label.setStyleSheet(f"""
-            font-size: 14px;
-            color: {c['text_secondary']};
-            background: transparent;
-        """)
-        self.please_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-        self.please_label.setWordWrap(True)
-        self.please_label.hide()
-        content_layout.addWidget(self.please_label)
-        
-        # Final ask label - "Leave a positive review..."
-        self.final_label = QLabel("")
-        self.final_label.setMinimumHeight(50)
-        self.final_label.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: 700;
-            color: {c['text']};
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-            background: transparent;
-        """)
-        self.final_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-        self.final_label.setWordWrap(True)
-        self.final_label.hide()
-        content_layout.addWidget(self.final_label)
+        # === ANIMATED TEXT ===
+        # A single rich-text label holds every phase: finished phases stay as
+        # styled paragraphs and the phase being typed is appended after them
+        self.text_label = QLabel("")
+        self.text_label.setTextFormat(Qt.TextFormat.RichText)
+        self.text_label.setStyleSheet(qss["text_label"])
+        self.text_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self.text_label.setWordWrap(True)
+        self.text_label.setMinimumHeight(_TEXT_MIN_HEIGHT)
+        content_layout.addWidget(self.text_label)
+        
+        self._phase_styles = qss["phases"]
+        self._html_buffer = []
+        self._committed_html = ""
         
         content_layout.addSpacing(20)
         
@@ -293,7 +398,7 @@ class ReviewOverlay(QWidget):
         
         # Review button - GitHub star button style
         self.review_btn = QPushButton()
-        self.review_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.review_btn.setCursor(_HAND_CURSOR)
         
         # Create button layout with icon + text + arrow
         review_btn_inner = QHBoxLayout(self.review_btn)
@@ -302,38 +407,22 @@ class ReviewOverlay(QWidget):
         
         # Star icon (checkbox style like GitHub)
         star_label = QLabel("⭐")
-        star_label.setStyleSheet(f"font-size: 18px; background: transparent;")
+        star_label.setStyleSheet(qss["star"])
         review_btn_inner.addWidget(star_label)
         
         # Button text
         text_label = QLabel("Leave a Review")
-        text_label.setStyleSheet(f"""
-            font-size: 15px;
-            font-weight: 500;
-            color: {c['text']};
-            background: transparent;
-        """)
+        text_label.setStyleSheet(qss["text"])
         review_btn_inner.addWidget(text_label)
         
         review_btn_inner.addStretch()
         
         # Arrow icon
         arrow_label = QLabel("↗")
-        arrow_label.setStyleSheet(f"font-size: 14px; color: {c['text_secondary']}; background: transparent;")
+        arrow_label.setStyleSheet(qss["arrow"])
         review_btn_inner.addWidget(arrow_label)
         
-        self.review_btn.setStyleSheet(f"""
-            QPushButton {{
-                background: {c['surface']};
-                border: 1px solid {c['border']};
-                border-radius: 10px;
-                min-height: 48px;
-            }}
-            QPushButton:hover {{
-                background: {c['hover']};
-                border-color: {c['text_secondary']};
-            }}
-        """)
+        self.review_btn.setStyleSheet(qss["review_btn"])
         self.review_btn.clicked.connect(self.on_review_clicked)
         btn_layout.addWidget(self.review_btn)
         
@@ -341,19 +430,8 @@ class ReviewOverlay(QWidget):
         
         # Skip button - guilt-inducing, very subtle
         self.skip_btn = QPushButton("No thanks, I'm mean")
-        self.skip_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        self.skip_btn.setStyleSheet(f"""
-            QPushButton {{
-                background: transparent;
-                color: {c['text_secondary']};
-                border: none;
-                font-size: 11px;
-                padding: 8px;
-            }}
-            QPushButton:hover {{
-                color: {c['text_secondary']};
-            }}
-        """)
+        self.skip_btn.setCursor(_HAND_CURSOR)
+        self.skip_btn.setStyleSheet(qss["skip_btn"])
         self.skip_btn.clicked.connect(self.on_skip_clicked)
         btn_layout.addWidget(self.skip_btn, 0, Qt.AlignmentFlag.AlignHCenter)
         
@@ -363,90 +441,76 @@ class ReviewOverlay(QWidget):
         main_layout.addStretch()
         
         # Start animation sequence after slide-down
-        QTimer.singleShot(1200, self.start_typing_sequence)
+        QTimer.singleShot(0 if self._reduced_motion else 1200, self.start_typing_sequence)
     
     def start_typing_sequence(self):
         """Begin the animated typing sequence."""
-        # Define all text phases
-        self.texts = [
-            ("phase1", "I know... Not this shit again.", True),  # (label_name, text, should_delete)
-            ("phase2", "I swear this is the last time I do this", True),
-            ("main", "So..... this add on took me fucking forever to build and I am updating it constantly.", False),
-            ("motivation", "The main way I stay motivated is if you do this", False),
-            ("please", "So.... Can you please and I mean pretty please with a giant cherry on top.", False),
-            ("final", "Leave a positive review on Anki about this add on. You are my only Hope.", False),
-        ]
-        
-        self.current_phase = 0
-        self.start_phase()
-    
-    def start_phase(self):
-        """Start typing the current phase."""
-        if self.current_phase >= len(self.texts):
-            # All done, show buttons
+        if self._reduced_motion:
+            # Skip the typewriter: show the final copy and the buttons right away
+            for phase_index, text, should_delete in _TYPING_SCRIPT:
+                if not should_delete:
+                    self._html_buffer.append(self._phase_html(phase_index, text))
+            self._committed_html = "".join(self._html_buffer)
+            self.text_label.setText(self._committed_html)
             self.show_buttons()
             return
         
-        label_name, text, should_delete = self.texts[self.current_phase]
-        
-        # Get the label for this phase
-        label_map = {
-            "phase1": self.phase1_label,
-            "phase2": self.phase2_label,
-            "main": self.main_label,
-            "motivation": self.motivation_label,
-            "please": self.please_label,
-            "final": self.final_label,
-        }
-        
-        self.current_label = label_map[label_name]
-        self.current_target = text
-        self.current_should_delete = should_delete
-        self.typing_index = 0
-        self.is_deleting = False
-        
-        # Show the label
-        self.current_label.show()
-        
-        # Start typing
-        self.typing_timer = QTimer()
-        self.typing_timer.timeout.connect(self.type_character)
+        # Precompute every typing/backspacing step so a single timer can drive
+        # all six phases: (kind, phase_index, text, delay_ms until the next step)
+        script = []
+        for phase_index, text, should_delete in _TYPING_SCRIPT:
+            for i in range(1, len(text)):
+                # Wrapped text only reflows at word boundaries, so that's the
+                # only place the label needs resizing mid-phase
+                kind = STEP_RELAYOUT if text[i - 1] in " \n" else STEP_TYPE
+                script.append((kind, phase_index, text[:i], 70))
+            if should_delete:
+                # Pause on the full text, then backspace quickly and move on
+                script.append((STEP_RELAYOUT, phase_index, text, 70 + 1200 + 40))
+                for i in range(len(text) - 1, 0, -1):
+                    script.append((STEP_TYPE, phase_index, text[:i], 40))
+                script.append((STEP_RELAYOUT, phase_index, "", 40 + 300 + 70))
+            else:
+                # Keep the finished phase in place above the next one
+                script.append((STEP_COMMIT, phase_index, text, 70 + 600 + 70))
+        script.append((STEP_DONE, None, "", 0))
+        
+        self._script = script
+        self._step = 0
+        self.text_label.raise_()  # Ensure label is on top
         self.typing_timer.start(70)
     
-    def type_character(self):
-        """Type or delete one character at a time."""
-        if self.is_deleting:
-            current = self.current_label.text()
-            if len(current) > 0:
-                self.current_label.setText(current[:-1])
-            else:
-                self.typing_timer.stop()
-                self.is_deleting = False
-                self.current_label.hide()
-                self.current_phase += 1
-                QTimer.singleShot(300, self.start_phase)
-        else:
-            if self.typing_index < len(self.current_target):
-                self.current_label.setText(self.current_target[:self.typing_index + 1])
-                self.current_label.adjustSize()  # Resize to fit wrapped text
-                self.current_label.raise_()  # Ensure label is on top
-                self.typing_index += 1
-            else:
-                self.typing_timer.stop()
-                if self.current_should_delete:
-                    # Pause then delete
-                    QTimer.singleShot(1200, self.start_backspace)
-                else:
-                    # Move to next phase
-                    self.current_phase += 1
-                    QTimer.singleShot(600, self.start_phase)
+    def _phase_html(self, phase_index, text):
+        """Render one phase's text as a styled rich-text paragraph."""
+        if not text:
+            return ""
+        return f'<p style="{self._phase_styles[phase_index]}">{html.escape(text)}</p>'
     
-    def start_backspace(self):
-        """Start deleting the current text."""
-        self.is_deleting = True
-        self.typing_timer = QTimer()
-        self.typing_timer.timeout.connect(self.type_character)
-        self.typing_timer.start(40)
+    def _advance(self):
+        """Run the next step of the typing script and schedule the one after."""
+        if not self.isVisible():
+            # Paused; showEvent picks the script back up
+            self.typing_timer.stop()
+            return
+        
+        kind, phase_index, text, delay = self._script[self._step]
+        self._step += 1
+        
+        if kind == STEP_DONE:
+            # All done, show buttons
+            self.show_buttons()
+            return
+        
+        current = self._phase_html(phase_index, text)
+        if kind == STEP_COMMIT:
+            self._html_buffer.append(current)
+            self._committed_html = "".join(self._html_buffer)
+            current = ""
+        self.text_label.setText(self._committed_html + current)
+        if kind != STEP_TYPE:
+            self.text_label.adjustSize()  # Resize to fit wrapped text
+        
+        self.typing_timer.start(delay)
     
     def show_buttons(self):
         """Show the action buttons."""
@@ -454,7 +518,6 @@ class ReviewOverlay(QWidget):
     
     def on_review_clicked(self):
         """Handle review button click."""
-        import webbrowser
         webbrowser.open(REVIEW_URL)
         self.exit_method = "clicked_review"
         # Wait 2 seconds before closing to let user focus on the browser
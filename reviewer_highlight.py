@@ -3,799 +3,91 @@ Reviewer highlight feature - Cursor-style floating action bar
 Shows a floating action bar when text is highlighted on flashcards
 """
 
+import json
+
 from aqt import mw, gui_hooks
-from .utils import ADDON_NAME
+from .utils import ADDON_NAME, format_shortcut_display
 from .theme_manager import ThemeManager
 
 
-# JavaScript code to inject into the reviewer
-HIGHLIGHT_BUBBLE_JS = """
-(function() {
-    // Only inject once
-    if (window.ankiHighlightBubbleInjected) {
-        return;
-    }
-    window.ankiHighlightBubbleInjected = true;
-    console.log('Anki: Injecting highlight bubble for OpenEvidence');
-
-    let bubble = null;
-    let currentState = 'default'; // 'default' or 'input'
-    let selectedText = '';
-    let cmdKeyHeld = false;
-    let contextText = ''; // Store context text for the pill
-
-    // Completely rewritten key matching - more aggressive approach
-    function checkShortcut(e, configKeys) {
-        if (!configKeys || configKeys.length === 0) return false;
-
-        var isMac = navigator.platform.toUpperCase().indexOf('MAC') >= 0;
-        var pressedKeys = {};
-
-        // Build pressed keys map
-        if (e.shiftKey) pressedKeys['Shift'] = true;
-        if (e.altKey) pressedKeys['Alt'] = true;
-        
-        if (isMac) {
-            if (e.ctrlKey) pressedKeys['Control'] = true;
-            if (e.metaKey) pressedKeys['Meta'] = true;
-        } else {
-            if (e.ctrlKey || e.metaKey) pressedKeys['Control/Meta'] = true;
-        }
-
-        // Get the regular key - try multiple methods for reliability
-        // On macOS, Control+T might give e.key as "Tab" (browser shortcut) but e.code as "KeyT"
-        var regularKey = null;
-        
-        // First try e.key if it's a single character
-        if (e.key && e.key.length === 1 && /^[A-Za-z0-9]$/.test(e.key)) {
-            regularKey = e.key.toUpperCase();
-        } 
-        // Fallback to e.code for more reliable detection (especially for Control combinations)
-        else if (e.code) {
-            // Match patterns like "KeyT", "KeyA", "Digit1", etc.
-            var codeMatch = e.code.match(/^(Key|Digit)([A-Z0-9])$/);
-            if (codeMatch) {
-                regularKey = codeMatch[2];
-            }
-        }
-
-        if (regularKey) {
-            pressedKeys[regularKey] = true;
-        }
-
-        // Check if all required keys are present
-        for (var i = 0; i < configKeys.length; i++) {
-            if (!pressedKeys[configKeys[i]]) {
-                return false;
-            }
-        }
-
-        // Verify exact count match
-        return Object.keys(pressedKeys).length === configKeys.length;
-    }
-
-    // Handle shortcut actions
-    function handleAskQuestion(e) {
-        e.preventDefault();
-        e.stopImmediatePropagation();  // More aggressive than stopPropagation
-        
-        const selection = window.getSelection();
-        const text = selection.toString().trim();
-        
-        if (text && text.length > 0) {
-            selectedText = text;
-            const range = selection.getRangeAt(0);
-            const rect = range.getBoundingClientRect();
-            bubble.style.display = 'block';
-            renderInputState();
-            setTimeout(() => positionBubble(rect), 0);
-            
-            // Notify tutorial that shortcut was used
-            try {
-                pycmd('openevidence:tutorial_event:shortcut_used');
-            } catch (err) {
-                // Ignore if pycmd not available
-            }
-        } else if (currentState === 'default' || bubble.style.display === 'none') {
-            selectedText = '';
-            const centerRect = {
-                left: window.innerWidth / 2,
-                right: window.innerWidth / 2,
-                top: window.innerHeight / 3,
-                bottom: window.innerHeight / 3,
-                width: 0,
-                height: 0
-            };
-            bubble.style.display = 'block';
-            renderInputState();
-            setTimeout(() => positionBubble(centerRect), 0);
-        }
-    }
-
-    function handleAddToChatShortcut(e) {
-        e.preventDefault();
-        e.stopImmediatePropagation();  // More aggressive than stopPropagation
-        
-        const selection = window.getSelection();
-        const text = selection.toString().trim();
-        
-        if (text && text.length > 0) {
-            selectedText = text;
-            handleAddToChat();  // Call the actual handler function
-            
-            // Notify tutorial that shortcut was used
-            try {
-                pycmd('openevidence:tutorial_event:shortcut_used');
-            } catch (err) {
-                // Ignore if pycmd not available
-            }
-        }
-    }
-
-    // Track Command/Meta key state (Mac) or Control key state (Windows/Linux)
-    document.addEventListener('keydown', (e) => {
-        var isMac = navigator.platform.toUpperCase().indexOf('MAC') >= 0;
-        if (isMac) {
-            if (e.metaKey || e.key === 'Meta' || e.key === 'Command') {
-                cmdKeyHeld = true;
-            }
-        } else {
-            if (e.ctrlKey || e.key === 'Control') {
-                cmdKeyHeld = true;
-            }
-        }
-    }, true);
-
-    // Main keyboard shortcut handler - completely rewritten
-    // Use capture phase with highest priority on window (not document)
-    window.addEventListener('keydown', function(e) {
-        // Get shortcuts from config
-        var askQuestionKeys = (window.quickActionsConfig && window.quickActionsConfig.askQuestion && window.quickActionsConfig.askQuestion.keys) || ['Meta', 'R'];
-        var addToChatKeys = (window.quickActionsConfig && window.quickActionsConfig.addToChat && window.quickActionsConfig.addToChat.keys) || ['Meta', 'F'];
-
-        // Early check: if Control key is pressed and it's part of our shortcuts, prevent default immediately
-        var isMac = navigator.platform.toUpperCase().indexOf('MAC') >= 0;
-        var hasControl = isMac ? e.ctrlKey : (e.ctrlKey || e.metaKey);
-        
-        if (hasControl) {
-            // Check if this Control combination matches any of our shortcuts
-            var askHasControl = askQuestionKeys.indexOf('Control') !== -1;
-            var chatHasControl = addToChatKeys.indexOf('Control') !== -1;
-            
-            if (askHasControl || chatHasControl) {
-                // Prevent default early for Control combinations to stop browser shortcuts
-                e.preventDefault();
-            }
-        }
-
-        // Debug logging
-        console.log('Quick Actions keydown:', {
-            key: e.key,
-            code: e.code,
-            ctrlKey: e.ctrlKey,
-            metaKey: e.metaKey,
-            shiftKey: e.shiftKey,
-            altKey: e.altKey,
-            askQuestionKeys: askQuestionKeys,
-            addToChatKeys: addToChatKeys,
-            checkResult: {
-                ask: checkShortcut(e, askQuestionKeys),
-                chat: checkShortcut(e, addToChatKeys)
-            }
-        });
-
-        // Check Ask Question shortcut
-        if (checkShortcut(e, askQuestionKeys)) {
-            console.log('Ask Question match!');
-            handleAskQuestion(e);
-            return false;  // Return false as additional prevention
-        }
-
-        // Check Add to Chat shortcut
-        if (checkShortcut(e, addToChatKeys)) {
-            console.log('Add to Chat match!');
-            handleAddToChatShortcut(e);
-            return false;  // Return false as additional prevention
-        }
-    }, true);  // Capture phase - intercept before anyone else
-
-    document.addEventListener('keyup', (e) => {
-        var isMac = navigator.platform.toUpperCase().indexOf('MAC') >= 0;
-        if (isMac) {
-            if (e.key === 'Meta' || e.key === 'Command') {
-                cmdKeyHeld = false;
-            }
-        } else {
-            if (e.key === 'Control') {
-                cmdKeyHeld = false;
-            }
-        }
-    });
-
-    // Also track when window loses focus (releases all keys)
-    window.addEventListener('blur', () => {
-        cmdKeyHeld = false;
-    });
-
-    // Create the bubble element
-    function createBubble() {
-        const div = document.createElement('div');
-        div.id = 'anki-highlight-bubble';
-        div.style.cssText = `
-            position: absolute;
-            background: var(--oa-background);
-            border-radius: 6px;
-            border: 1px solid var(--oa-border);
-            padding: 4px;
-            z-index: 9999;
-            display: none;
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-            font-size: 12px;
-            color: var(--oa-text);
-            line-height: 1;
-            min-height: auto;
-            overflow: hidden;
-        `;
-        document.body.appendChild(div);
-        return div;
-    }
-
-    // Render default state with two buttons and divider
-    function renderDefaultState() {
-        currentState = 'default';
-        // Remove shadow for the buttons bar (flat look)
-        bubble.style.boxShadow = 'none';
-        
-        bubble.innerHTML = `
-            <div style="display: flex; align-items: center; gap: 1px; line-height: 1; margin: 0; padding: 0;">
-                <button id="add-to-chat-btn" style="
-                    background: transparent;
-                    border: none;
-                    box-shadow: none;
-                    color: var(--oa-text);
-                    padding: 2px 8px;
-                    cursor: pointer;
-                    border-radius: 3px;
-                    font-size: 12px;
-                    font-weight: 500;
-                    transition: all 0.15s ease;
-                    white-space: nowrap;
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 6px;
-                    line-height: 1;
-                    margin: 0;
-                ">
-                    <span>Add to Chat</span>
-                    <span style="font-size: 10px; color: var(--oa-text-secondary); font-weight: 400;">${window.quickActionsConfig?.addToChat?.display || '⌘F'}</span>
-                </button>
-                <div style="width: 1px; height: 14px; background-color: var(--oa-border); margin: 0;"></div>
-                <button id="ask-question-btn" style="
-                    background: transparent;
-                    border: none;
-                    box-shadow: none;
-                    color: var(--oa-text);
-                    padding: 2px 8px;
-                    cursor: pointer;
-                    border-radius: 3px;
-                    font-size: 12px;
-                    font-weight: 500;
-                    transition: all 0.15s ease;
-                    white-space: nowrap;
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 6px;
-                    line-height: 1;
-                    margin: 0;
-                ">
-                    <span>Ask Question</span>
-                    <span style="font-size: 10px; color: var(--oa-text-secondary); font-weight: 400;">${window.quickActionsConfig?.askQuestion?.display || '⌘R'}</span>
-                </button>
-            </div>
-        `;
-
-        // Add hover effects
-        const addToChatBtn = bubble.querySelector('#add-to-chat-btn');
-        const askQuestionBtn = bubble.querySelector('#ask-question-btn');
-
-        addToChatBtn.addEventListener('mouseenter', () => {
-            addToChatBtn.style.backgroundColor = 'var(--oa-hover)';
-        });
-        addToChatBtn.addEventListener('mouseleave', () => {
-            addToChatBtn.style.backgroundColor = 'transparent';
-        });
-
-        askQuestionBtn.addEventListener('mouseenter', () => {
-            askQuestionBtn.style.backgroundColor = 'var(--oa-hover)';
-        });
-        askQuestionBtn.addEventListener('mouseleave', () => {
-            askQuestionBtn.style.backgroundColor = 'transparent';
-        });
-
-        // Add click handlers
-        addToChatBtn.addEventListener('click', (e) => {
-            e.stopPropagation();
-            handleAddToChat();
-        });
-        // Prevent mouseup/mousedown from bubbling to document level
-        addToChatBtn.addEventListener('mouseup', (e) => {
-            e.stopPropagation();
-        });
-        addToChatBtn.addEventListener('mousedown', (e) => {
-            e.stopPropagation();
-        });
-
-        askQuestionBtn.addEventListener('click', (e) => {
-            e.stopPropagation();
-            renderInputState();
-        });
-        // Prevent mouseup/mousedown from bubbling to document level
-        askQuestionBtn.addEventListener('mouseup', (e) => {
-            e.stopPropagation();
-        });
-        askQuestionBtn.addEventListener('mousedown', (e) => {
-            e.stopPropagation();
-        });
-    }
-
-    function renderInputState() {
-        currentState = 'input';
-        // Add shadow back for the input bubble so it stands out
-        bubble.style.boxShadow = '0 4px 12px var(--oa-shadow)';
-        
-        bubble.innerHTML = `
-            <div style="
-                display: flex;
-                flex-direction: column;
-                padding: 0px;
-                gap: 0px;
-                min-width: 280px;
-                max-width: 380px;
-                position: relative;
-            ">
-                <div style="display: flex; align-items: flex-start; gap: 4px; padding: 7px 6px 6px 8px;">
-                    <textarea
-                        id="question-input"
-                        placeholder="Ask a question..."
-                        rows="1"
-                        style="
-                            background: transparent;
-                            border: none;
-                            color: var(--oa-text);
-                            padding: 0;
-                            font-size: 13px;
-                            font-weight: 500;
-                            outline: none;
-                            flex: 1;
-                            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                            resize: none;
-                            overflow-y: auto;
-                            min-height: 10px;
-                            max-height: 100px;
-                            line-height: 1.3;
-                            word-wrap: break-word;
-                            margin: 0;
-                        "
-                    ></textarea>
-                    <button id="close-btn" style="
-                        appearance: none;
-                        -webkit-appearance: none;
-                        background: transparent;
-                        border: none;
-                        box-shadow: none;
-                        outline: none;
-                        color: var(--oa-text-secondary);
-                        cursor: pointer;
-                        font-size: 13px;
-                        padding: 0;
-                        width: 18px;
-                        height: 18px;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        transition: all 0.15s ease;
-                        line-height: 1;
-                        flex-shrink: 0;
-                        margin: 0;
-                        margin-left: auto;
-                        margin-right: -1px;
-                        border-radius: 0;
-                    ">✕</button>
-                </div>
-
-                <div style="display: flex; justify-content: space-between; align-items: center; margin: 0; padding: 0 6px 6px 8px;">
-                    <div id="context-pill" style="
-                        display: flex;
-                        align-items: center;
-                        gap: 6px;
-                        background: var(--oa-hover);
-                        border: 1px dashed var(--oa-border);
-                        border-radius: 12px;
-                        padding: 2px 8px;
-                        height: 20px;
-                        box-sizing: border-box;
-                        font-size: 10px;
-                        color: var(--oa-text-secondary);
-                        cursor: pointer;
-                        transition: all 0.15s ease;
-                        max-width: 180px;
-                        white-space: nowrap;
-                        overflow: hidden;
-                    ">
-                        <span id="context-text" style="
-                            overflow: hidden;
-                            text-overflow: ellipsis;
-                            line-height: 1.2;
-                        ">Select text +</span>
-                        <button id="context-clear" style="
-                            display: none;
-                            background: transparent;
-                            border: none;
-                            color: inherit;
-                            cursor: pointer;
-                            font-size: 10px;
-                            padding: 0;
-                            width: 10px;
-                            height: 10px;
-                            flex-shrink: 0;
-                            line-height: 1;
-                            opacity: 0.7;
-                        ">✕</button>
-                    </div>
-                    <button id="submit-btn" style="
-                        background: var(--oa-accent);
-                        border: none;
-                        color: #ffffff;
-                        padding: 0;
-                        cursor: pointer;
-                        border-radius: 50%;
-                        font-size: 13px;
-                        font-weight: 600;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        transition: all 0.15s ease;
-                        width: 19px;
-                        height: 19px;
-                        flex-shrink: 0;
-                        margin: 0;
-                    "><svg width="10" height="11" viewBox="0 0 10 11" fill="none" xmlns="http://www.w3.org/2000/svg"><path d="M5 1.5V9.5M5 1.5L2 4.5M5 1.5L8 4.5" stroke="currentColor" stroke-width="1.5" stroke-linecap="round" stroke-linejoin="round"/></svg></button>
-                </div>
-            </div>
-        `;
-
-        const input = bubble.querySelector('#question-input');
-        const submitBtn = bubble.querySelector('#submit-btn');
-        const closeBtn = bubble.querySelector('#close-btn');
-        const contextPill = bubble.querySelector('#context-pill');
-        const contextTextSpan = bubble.querySelector('#context-text');
-        const contextClearBtn = bubble.querySelector('#context-clear');
-
-        // Auto-resize textarea as user types
-        function autoResize() {
-            input.style.height = 'auto';
-            input.style.height = Math.min(input.scrollHeight, 100) + 'px';
-        }
-
-        // Update context pill based on contextText
-        function updateContextPill() {
-            if (contextText) {
-                // State B: Active (Selection)
-                const truncated = contextText.length > 9 ? contextText.substring(0, 9) + '...' : contextText;
-                contextTextSpan.textContent = '"' + truncated + '"';
-                contextClearBtn.style.display = 'block';
-
-                // Style changes with glow effect to show selection
-                contextPill.style.borderStyle = 'solid';
-                contextPill.style.borderColor = 'rgba(59, 130, 246, 0.6)'; // Keep accent semi-transparent (hard to do with vars unless we split RGB)
-                contextPill.style.color = 'var(--oa-text)';
-                contextPill.style.background = 'rgba(59, 130, 246, 0.1)';
-                contextPill.style.boxShadow = '0 0 8px rgba(59, 130, 246, 0.4)';
-            } else {
-                // State A: Empty (Default)
-                contextTextSpan.textContent = 'Select text +';
-                contextClearBtn.style.display = 'none';
-
-                // Reset styles
-                contextPill.style.borderStyle = 'dashed';
-                contextPill.style.borderColor = 'var(--oa-border)';
-                contextPill.style.color = 'var(--oa-text-secondary)';
-                contextPill.style.background = 'var(--oa-hover)';
-                contextPill.style.boxShadow = 'none';
-            }
-        }
-
-        // Clear context
-        function clearContext() {
-            contextText = '';
-            updateContextPill();
-        }
-
-        // Focus the input
-        setTimeout(() => input.focus(), 0);
+# Static script served from the add-on's web/ folder (see setup_highlight_hooks)
+HIGHLIGHT_BUBBLE_JS_FILE = "web/highlight_bubble.js"
 
-        // Initialize context with selectedText if available
-        if (selectedText && !contextText) {
-            contextText = selectedText;
-        }
+# card_will_show contexts the bubble is shown in
+_REVIEW_CONTEXTS = frozenset({"reviewQuestion", "reviewAnswer"})
 
-        // Initialize context pill
-        updateContextPill();
+# Set once setup_highlight_hooks has run, so the hooks are only added once
+_hooks_registered = False
 
-        // Auto-resize on input
-        input.addEventListener('input', autoResize);
+# CSS variable <style> blocks, keyed by theme id
+_CSS_VARS_CACHE = {}
 
-        // Submit on Enter key (without Shift)
-        input.addEventListener('keydown', (e) => {
-            if (e.key === 'Enter' && !e.shiftKey) {
-                e.preventDefault();
-                handleSubmitQuestion();
-            }
-        });
+# Quick actions config <script>, rebuilt after invalidate_config_cache
+_config_js_cache = None
 
-        // Hover effect for submit button
-        submitBtn.addEventListener('mouseenter', () => {
-            submitBtn.style.backgroundColor = 'var(--oa-accent-hover)';
-        });
-        submitBtn.addEventListener('mouseleave', () => {
-            submitBtn.style.backgroundColor = 'var(--oa-accent)';
-        });
-
-        // Hover effect for close button
-        closeBtn.addEventListener('mouseenter', () => {
-            closeBtn.style.color = 'var(--oa-text)';
-        });
-        closeBtn.addEventListener('mouseleave', () => {
-            closeBtn.style.color = 'var(--oa-text-secondary)';
-        });
-
-        // Close button handler
-        closeBtn.addEventListener('click', (e) => {
-            e.stopPropagation();
-            hideBubble();
-        });
-        closeBtn.addEventListener('mouseup', (e) => {
-            e.stopPropagation();
-        });
-        closeBtn.addEventListener('mousedown', (e) => {
-            e.stopPropagation();
-        });
-
-        // Click handler for submit button
-        submitBtn.addEventListener('click', (e) => {
-            e.stopPropagation();
-            handleSubmitQuestion();
-        });
-        // Prevent mouseup/mousedown from bubbling to document level
-        submitBtn.addEventListener('mouseup', (e) => {
-            e.stopPropagation();
-        });
-        submitBtn.addEventListener('mousedown', (e) => {
-            e.stopPropagation();
-        });
-
-        // Context pill click handler (State A: show hint)
-        contextPill.addEventListener('click', (e) => {
-            e.stopPropagation();
-            if (!contextText) {
-                // Show hint
-                const originalText = contextTextSpan.textContent;
-                contextTextSpan.textContent = 'Highlight text on page';
-                setTimeout(() => {
-                    if (!contextText) {
-                        contextTextSpan.textContent = originalText;
-                    }
-                }, 1500);
-            }
-        });
-
-        // Context clear button handler
-        contextClearBtn.addEventListener('click', (e) => {
-            e.stopPropagation();
-            clearContext();
-        });
-        contextClearBtn.addEventListener('mouseup', (e) => {
-            e.stopPropagation();
-        });
-        contextClearBtn.addEventListener('mousedown', (e) => {
-            e.stopPropagation();
-        });
-
-        // Listen for text selection while bubble is open
-        const selectionHandler = () => {
-            const selection = window.getSelection();
-            const text = selection.toString().trim();
-            if (text && text.length > 0 && currentState === 'input') {
-                contextText = text;
-                updateContextPill();
-            }
-        };
-        document.addEventListener('mouseup', selectionHandler);
-
-        // Clean up listener when bubble is hidden
-        const originalHideBubble = hideBubble;
-        window.hideBubbleWithCleanup = function() {
-            document.removeEventListener('mouseup', selectionHandler);
-            originalHideBubble();
-        };
-    }
-
-    // Handle "Add to Chat" action
-    function handleAddToChat() {
-        console.log('Anki: Add to Chat clicked, text:', selectedText);
-        // Send message to Python
-        pycmd('openevidence:add_context:' + encodeURIComponent(selectedText));
-        hideBubble();
-    }
-
-    // Handle question submission
-    function handleSubmitQuestion() {
-        const input = bubble.querySelector('#question-input');
-        const query = input.value.trim();
-
-        if (query) {
-            // Use contextText if available, otherwise use selectedText
-            const finalContext = contextText || selectedText;
-            console.log('Anki: Question submitted:', query, 'Context:', finalContext);
-            // Send message to Python with format: query|context
-            pycmd('openevidence:ask_query:' + encodeURIComponent(query) + '|' + encodeURIComponent(finalContext));
-            hideBubble();
-            // Clear context after submission
-            contextText = '';
-        }
-    }
-
-    // Position the bubble above or below the selection
-    function positionBubble(rect) {
-        const bubbleHeight = bubble.offsetHeight;
-        const bubbleWidth = bubble.offsetWidth;
-        const padding = 20; // Vertical padding between selection and bubble
-
-        // Position horizontally based on the end (right edge) of the selection
-        // Align bubble's right edge near the selection's right edge
-        let left = rect.right - bubbleWidth;
-
-        // Keep bubble within viewport horizontal bounds with some margin
-        const margin = 10;
-        if (left < margin) {
-            left = margin;
-        }
-        if (left + bubbleWidth > window.innerWidth - margin) {
-            left = window.innerWidth - bubbleWidth - margin;
-        }
-
-        // Default: Position below the selection
-        let top = rect.bottom + padding;
-
-        // Check: Would it go off the bottom of the screen?
-        if (top + bubbleHeight > window.innerHeight) {
-            // Flip: Position above the selection instead
-            top = rect.top - bubbleHeight - padding;
-        }
-
-        bubble.style.left = left + window.scrollX + 'px';
-        bubble.style.top = top + window.scrollY + 'px';
-    }
-
-    // Show the bubble
-    function showBubble(rect, text) {
-        selectedText = text;
-        renderDefaultState();
-        bubble.style.display = 'block';
-
-        // Position after render so we have accurate dimensions
-        setTimeout(() => positionBubble(rect), 0);
-        
-        // Notify tutorial that text was highlighted (Quick Action bar is showing)
-        try {
-            pycmd('openevidence:tutorial_event:text_highlighted');
-        } catch (e) {
-            // Ignore if pycmd not available
-        }
-    }
-
-    // Hide the bubble
-    function hideBubble() {
-        bubble.style.display = 'none';
-        currentState = 'default';
-        contextText = ''; // Clear context when bubble is hidden
-    }
-
-    // Drag functionality
-    let isDragging = false;
-    let dragOffsetX = 0;
-    let dragOffsetY = 0;
-
-    function startDrag(e) {
-        // Don't start drag on buttons, inputs, or textareas
-        if (e.target.tagName === 'BUTTON' || e.target.tagName === 'INPUT' || e.target.tagName === 'TEXTAREA') {
-            return;
-        }
-
-        isDragging = true;
-        const rect = bubble.getBoundingClientRect();
-        dragOffsetX = e.clientX - rect.left;
-        dragOffsetY = e.clientY - rect.top;
-        bubble.style.cursor = 'grabbing';
-        e.preventDefault();
-    }
-
-    function drag(e) {
-        if (!isDragging) return;
+_CONFIG_JS_TEMPLATE = """
+<script>
+if (!window.quickActionsConfig) {{
+    window.quickActionsConfig = {{}};
+}}
+window.quickActionsConfig.addToChat = {{
+    keys: {add_keys},
+    display: {add_display}
+}};
+window.quickActionsConfig.askQuestion = {{
+    keys: {ask_keys},
+    display: {ask_display}
+}};
+</script>
+"""
 
-        const newLeft = e.clientX - dragOffsetX;
-        const newTop = e.clientY - dragOffsetY;
 
-        bubble.style.left = newLeft + 'px';
-        bubble.style.top = newTop + 'px';
-    }
+def _get_css_variables():
+    """Get the CSS variables block for the current theme, building it on first use."""
+    theme_id = ThemeManager.current_theme_id()
+    css_vars = _CSS_VARS_CACHE.get(theme_id)
+    if css_vars is None:
+        css_vars = _CSS_VARS_CACHE[theme_id] = ThemeManager.get_css_variables()
+    return css_vars
 
-    function stopDrag() {
-        if (isDragging) {
-            isDragging = false;
-            bubble.style.cursor = 'default';
-        }
-    }
 
-    // Add drag event listeners to the bubble
-    document.addEventListener('mousedown', (e) => {
-        if (bubble.contains(e.target) && bubble.style.display !== 'none') {
-            startDrag(e);
-        }
-    });
+def invalidate_config_cache(*_args):
+    """Drop the cached shortcut config so the next card re-reads it
 
-    document.addEventListener('mousemove', drag);
-    document.addEventListener('mouseup', stopDrag);
+    Call after writing quick_actions to the add-on config.
+    """
+    global _config_js_cache
+    _config_js_cache = None
 
-    // Handle mouseup event
-    document.addEventListener('mouseup', (e) => {
-        // Small delay to allow selection to complete
-        setTimeout(() => {
-            const selection = window.getSelection();
-            const text = selection.toString().trim();
 
-            // Only show bubble if Command/Meta key is held AND text is selected
-            if (text && text.length > 0 && cmdKeyHeld) {
-                // Get selection range
-                const range = selection.getRangeAt(0);
+def _get_config_js():
+    """Get the quick actions config <script>, building it on first use"""
+    global _config_js_cache
+    if _config_js_cache is not None:
+        return _config_js_cache
 
-                // For multi-line selections, get the END position specifically
-                const endRange = document.createRange();
-                endRange.setStart(range.endContainer, range.endOffset);
-                endRange.setEnd(range.endContainer, range.endOffset);
-                const endRect = endRange.getBoundingClientRect();
+    # Load shortcuts from config
+    config = mw.addonManager.getConfig(ADDON_NAME) or {}
+    quick_actions = config.get("quick_actions", {
+        "add_to_chat": {"keys": ["Meta", "F"]},
+        "ask_question": {"keys": ["Meta", "R"]}
+    })
 
-                // Use the full selection rect but with the end position for horizontal alignment
-                const rect = range.getBoundingClientRect();
-                const combinedRect = {
-                    left: rect.left,
-                    right: endRect.right || rect.right,
-                    top: rect.top,
-                    bottom: rect.bottom,
-                    width: rect.width,
-                    height: rect.height
-                };
+    # Format shortcuts for JavaScript
+    add_to_chat_keys = quick_actions["add_to_chat"]["keys"]
+    ask_question_keys = quick_actions["ask_question"]["keys"]
 
-                showBubble(combinedRect, text);
-            } else {
-                // No text selected - hide bubble if in default state and clicking outside
-                if (currentState === 'default' && !bubble.contains(e.target)) {
-                    hideBubble();
-                }
-            }
-        }, 10);
-    });
+    add_to_chat_display = format_shortcut_display(tuple(add_to_chat_keys))
+    ask_question_display = format_shortcut_display(tuple(ask_question_keys))
 
-    // Note: Bubble no longer auto-hides when clicking outside
-    // Only the X button in the input state can close the bubble
-
-    // Create the bubble on load
-    bubble = createBubble();
-    console.log('Anki: Highlight bubble ready');
-})();
-"""
+    # Serialized as JSON so any key label is a valid JS literal
+    _config_js_cache = _CONFIG_JS_TEMPLATE.format(
+        add_keys=json.dumps(add_to_chat_keys),
+        add_display=json.dumps(add_to_chat_display),
+        ask_keys=json.dumps(ask_question_keys),
+        ask_display=json.dumps(ask_question_display),
+    )
+    return _config_js_cache
 
 
 def inject_highlight_bubble(html, card, context):
@@ -811,63 +103,35 @@ def inject_highlight_bubble(html, card, context):
         Modified HTML with injected JavaScript
     """
     # Only inject in review context (not in card layout or preview)
-    if context in ("reviewQuestion", "reviewAnswer"):
-        # Load shortcuts from config
-        from aqt import mw
-        config = mw.addonManager.getConfig(ADDON_NAME) or {}
-        quick_actions = config.get("quick_actions", {
-            "add_to_chat": {"keys": ["Meta", "F"]},
-            "ask_question": {"keys": ["Meta", "R"]}
-        })
-
-        # Format shortcuts for JavaScript
-        add_to_chat_keys = quick_actions["add_to_chat"]["keys"]
-        ask_question_keys = quick_actions["ask_question"]["keys"]
-
-        # Create display text (e.g., "⌘F" or "Ctrl+Shift+F")
-        def format_shortcut_display(keys):
-            display_keys = []
-            for key in keys:
-                if key == "Meta":
-                    display_keys.append("⌘")
-                elif key == "Control":
-                    display_keys.append("Ctrl")
-                elif key == "Shift":
-                    display_keys.append("Shift")
-                elif key == "Alt":
-                    display_keys.append("Alt")
-                else:
-                    display_keys.append(key)
-            return "".join(display_keys) if "⌘" in display_keys else "+".join(display_keys)
+    if context in _REVIEW_CONTEXTS:
+        # The bubble script itself is added once per reviewer page by
+        # on_webview_will_set_content; only the theme variables and the
+        # shortcut config (both cached) go with each card
+        return html + _get_css_variables() + _get_config_js()
+    
+    return html
 
-        add_to_chat_display = format_shortcut_display(add_to_chat_keys)
-        ask_question_display = format_shortcut_display(ask_question_keys)
 
-        # Prepend config and append main script
-        config_js = f"""
-        <script>
-        if (!window.quickActionsConfig) {{
-            window.quickActionsConfig = {{}};
-        }}
-        window.quickActionsConfig.addToChat = {{
-            keys: {add_to_chat_keys},
-            display: "{add_to_chat_display}"
-        }};
-        window.quickActionsConfig.askQuestion = {{
-            keys: {ask_question_keys},
-            display: "{ask_question_display}"
-        }};
-        </script>
-        """
+def on_webview_will_set_content(web_content, context):
+    """Add the highlight bubble script to the reviewer page once per page load
 
-        # Get CSS variables from ThemeManager
-        css_vars = ThemeManager.get_css_variables()
-        
-        return html + css_vars + config_js + f"<script>{HIGHLIGHT_BUBBLE_JS}</script>"
-    
-    return html
+    Card flips only swap the card HTML, so the script is loaded once for the
+    lifetime of the reviewer webview instead of being re-sent with every card.
+    It is referenced by a stable URL so the webview can cache it.
+    """
+    from aqt.reviewer import Reviewer
+    if isinstance(context, Reviewer):
+        web_content.js.append(f"/_addons/{ADDON_NAME}/{HIGHLIGHT_BUBBLE_JS_FILE}")
 
 
 def setup_highlight_hooks():
-    """Register the highlight bubble injection hook"""
+    """Register the highlight bubble injection hooks (safe to call more than once)"""
+    global _hooks_registered
+    if _hooks_registered:
+        return
+    mw.addonManager.setWebExports(__name__, r"web/.*\.js")
+    # Edits made through Anki's add-on config dialog
+    mw.addonManager.setConfigUpdatedAction(__name__, invalidate_config_cache)
     gui_hooks.card_will_show.append(inject_highlight_bubble)
+    gui_hooks.webview_will_set_content.append(on_webview_will_set_content)
+    _hooks_registered = True
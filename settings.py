@@ -6,11 +6,26 @@ This module re-exports all settings components from their individual modules
 for backward compatibility.
 """
 
-# Import all settings components from their individual modules
-from .settings_utils import ElidedLabel
-from .settings_home import SettingsHomeView
-from .settings_editor import SettingsEditorView
-from .settings_list import SettingsListView
+import importlib
+
+# Each component is imported from its own module on first access (PEP 562),
+# so the editor and list views' Qt widget trees aren't loaded at startup
+_COMPONENT_MODULES = {
+    'ElidedLabel': 'settings_utils',
+    'SettingsHomeView': 'settings_home',
+    'SettingsEditorView': 'settings_editor',
+    'SettingsListView': 'settings_list',
+}
+
+
+def __getattr__(name):
+    module_name = _COMPONENT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module('.' + module_name, __package__), name)
+    globals()[name] = value
+    return value
+
 
 # Export all components for backward compatibility
 __all__ = [
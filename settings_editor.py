@@ -7,7 +7,7 @@ from aqt import mw
 from aqt.utils import tooltip
 
 from aqt.utils import tooltip
-from .utils import ADDON_NAME
+from .utils import ADDON_NAME, format_keys_verbose
 
 try:
     from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QTextEdit
@@ -23,6 +23,103 @@ from .key_recorder import KeyRecorderMixin
 from .theme_manager import ThemeManager
 
 
+# Editor stylesheets, keyed by theme id
+_QSS_CACHE = {}
+
+
+def _get_stylesheets(theme_id):
+    """Get the editor stylesheets for a theme, building them on first use."""
+    cached = _QSS_CACHE.get(theme_id)
+    if cached is not None:
+        return cached
+
+    c = ThemeManager.get_palette()
+    cached = {
+        "textedit": f"""
+            QTextEdit {{
+                background-color: {c['surface']};
+                border: 1px solid {c['border']};
+                border-radius: 6px;
+                padding: 8px;
+                color: {c['text']};
+                font-size: 13px;
+                font-family: Menlo, Monaco, 'Courier New', monospace;
+            }}
+            QScrollBar:vertical {{
+                width: 8px;
+                background: transparent;
+            }}
+            QScrollBar::handle:vertical {{
+                background: {c['border']};
+                border-radius: 4px;
+            }}
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+                height: 0px;
+            }}
+        """,
+        "chip": ThemeManager.get_keycap_style(),
+        "save_enabled": f"""
+            QPushButton {{
+                background: {c['accent']};
+                color: #ffffff;
+                border: none;
+                border-radius: 8px;
+                font-size: 14px;
+                font-weight: 600;
+            }}
+            QPushButton:hover {{
+                background: {c['accent_hover']};
+            }}
+        """,
+        "save_disabled": f"""
+            QPushButton {{
+                background: {c['surface']};
+                color: {c['text_secondary']};
+                border: 1px solid {c['border']};
+                border-radius: 8px;
+                font-size: 14px;
+                font-weight: 600;
+            }}
+        """,
+        "key_recording": f"""
+            QPushButton {{
+                background: {c['surface']};
+                color: {c['accent']};
+                border: 2px solid {c['accent']};
+                border-radius: 8px;
+                font-size: 14px;
+                font-weight: 500;
+            }}
+        """,
+        "key_set": f"""
+            QPushButton {{
+                background: {c['surface']};
+                color: {c['text']};
+                border: 1px solid {c['border']};
+                border-radius: 8px;
+                font-size: 14px;
+            }}
+            QPushButton:hover {{
+                border-color: {c['text_secondary']};
+            }}
+        """,
+        "key_empty": f"""
+            QPushButton {{
+                background: {c['surface']};
+                color: {c['text_secondary']};
+                border: 1px dashed {c['border']};
+                border-radius: 8px;
+                font-size: 14px;
+            }}
+            QPushButton:hover {{
+                border-color: {c['text_secondary']};
+            }}
+        """,
+    }
+    _QSS_CACHE[theme_id] = cached
+    return cached
+
+
 class SettingsEditorView(KeyRecorderMixin, QWidget):
     """View B: Editor for a single keybinding - drill-down view"""
     def __init__(self, parent=None, keybinding=None, index=None):
@@ -42,13 +139,17 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
         self.setup_ui()
 
     def setup_ui(self):
+        # Build the whole widget tree before allowing any repaint
+        self.setUpdatesEnabled(False)
+
         # Main layout
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
 
         c = ThemeManager.get_palette()
-        
+        qss = _get_stylesheets(ThemeManager.current_theme_id())
+
         # Scrollable content area
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -81,28 +182,7 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
         # Row 2: Input
         self.question_template = QTextEdit()
         self.question_template.setPlainText(self.keybinding.get("question_template", ""))
-        self.question_template.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: {c['surface']};
-                border: 1px solid {c['border']};
-                border-radius: 6px;
-                padding: 8px;
-                color: {c['text']};
-                font-size: 13px;
-                font-family: Menlo, Monaco, 'Courier New', monospace;
-            }}
-            QScrollBar:vertical {{
-                width: 8px;
-                background: transparent;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {c['border']};
-                border-radius: 4px;
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-        """)
+        self.question_template.setStyleSheet(qss["textedit"])
         self.question_template.setMinimumHeight(100)
         content_layout.addWidget(self.question_template)
 
@@ -115,12 +195,7 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
         q_help.setStyleSheet(f"color: {c['text_secondary']}; font-size: 11px;")
         q_footer_layout.addWidget(q_help, 1)  # Stretch factor 1 to absorb flexible space
 
-        q_front_chip = QPushButton("+ {front}")
-        q_front_chip.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        q_front_chip.setFixedHeight(24)
-        q_front_chip.setMinimumWidth(75)
-        q_front_chip.setStyleSheet(ThemeManager.get_keycap_style())
-        q_front_chip.clicked.connect(lambda: self.insert_variable(self.question_template, "{front}"))
+        q_front_chip = self._make_chip("+ {front}", self.question_template, "{front}", qss["chip"])
         q_footer_layout.addWidget(q_front_chip)
 
         content_layout.addLayout(q_footer_layout)
@@ -134,28 +209,7 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
         # Row 2: Input
         self.answer_template = QTextEdit()
         self.answer_template.setPlainText(self.keybinding.get("answer_template", ""))
-        self.answer_template.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: {c['surface']};
-                border: 1px solid {c['border']};
-                border-radius: 6px;
-                padding: 8px;
-                color: {c['text']};
-                font-size: 13px;
-                font-family: Menlo, Monaco, 'Courier New', monospace;
-            }}
-            QScrollBar:vertical {{
-                width: 8px;
-                background: transparent;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {c['border']};
-                border-radius: 4px;
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-        """)
+        self.answer_template.setStyleSheet(qss["textedit"])
         self.answer_template.setMinimumHeight(100)
         content_layout.addWidget(self.answer_template)
 
@@ -168,20 +222,10 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
         a_help.setStyleSheet(f"color: {c['text_secondary']}; font-size: 11px;")
         a_footer_layout.addWidget(a_help, 1)  # Stretch factor 1 to absorb flexible space
 
-        a_front_chip = QPushButton("+ {front}")
-        a_front_chip.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        a_front_chip.setFixedHeight(24)
-        a_front_chip.setMinimumWidth(75)
-        a_front_chip.setStyleSheet(ThemeManager.get_keycap_style())
-        a_front_chip.clicked.connect(lambda: self.insert_variable(self.answer_template, "{front}"))
+        a_front_chip = self._make_chip("+ {front}", self.answer_template, "{front}", qss["chip"])
         a_footer_layout.addWidget(a_front_chip)
 
-        a_back_chip = QPushButton("+ {back}")
-        a_back_chip.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        a_back_chip.setFixedHeight(24)
-        a_back_chip.setMinimumWidth(75)
-        a_back_chip.setStyleSheet(ThemeManager.get_keycap_style())
-        a_back_chip.clicked.connect(lambda: self.insert_variable(self.answer_template, "{back}"))
+        a_back_chip = self._make_chip("+ {back}", self.answer_template, "{back}", qss["chip"])
         a_footer_layout.addWidget(a_back_chip)
 
         content_layout.addLayout(a_footer_layout)
@@ -208,45 +252,31 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
 
         layout.addWidget(bottom_section)
 
-        # Store initial state to detect changes
-        self._initial_state = {
-            'keys': self.keybinding.get('keys', []).copy() if self.keybinding.get('keys') else [],
-            'question_template': self.keybinding.get('question_template', ''),
-            'answer_template': self.keybinding.get('answer_template', '')
-        }
+        # Store initial keys to detect changes; any template edit marks the
+        # editor dirty without re-reading both templates per keystroke
+        self._initial_keys = tuple(self.keybinding.get('keys') or ())
+        self._dirty = False
 
         # Connect change signals
-        self.question_template.textChanged.connect(self._on_change)
-        self.answer_template.textChanged.connect(self._on_change)
+        self.question_template.textChanged.connect(self._mark_dirty)
+        self.answer_template.textChanged.connect(self._mark_dirty)
+
+        self.setUpdatesEnabled(True)
 
     def _update_save_button_style(self):
         """Update save button appearance based on enabled state"""
-        c = ThemeManager.get_palette()
-        if self.save_btn.isEnabled():
-            self.save_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: {c['accent']};
-                    color: #ffffff;
-                    border: none;
-                    border-radius: 8px;
-                    font-size: 14px;
-                    font-weight: 600;
-                }}
-                QPushButton:hover {{
-                    background: {c['accent_hover']};
-                }}
-            """)
-        else:
-            self.save_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background: {c['surface']};
-                    color: {c['text_secondary']};
-                    border: 1px solid {c['border']};
-                    border-radius: 8px;
-                    font-size: 14px;
-                    font-weight: 600;
-                }}
-            """)
+        qss = _get_stylesheets(ThemeManager.current_theme_id())
+        self.save_btn.setStyleSheet(qss["save_enabled"] if self.save_btn.isEnabled() else qss["save_disabled"])
+
+    def _make_chip(self, label, text_edit, variable, style):
+        """Create a chip button that inserts a template variable into text_edit"""
+        chip = QPushButton(label)
+        chip.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        chip.setFixedHeight(24)
+        chip.setMinimumWidth(75)
+        chip.setStyleSheet(style)
+        chip.clicked.connect(lambda: self.insert_variable(text_edit, variable))
+        return chip
 
     def insert_variable(self, text_edit, variable):
         """Insert a variable at the current cursor position in a QTextEdit"""
@@ -254,71 +284,27 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
         cursor.insertText(variable)
         text_edit.setFocus()
 
-    def _on_change(self):
-        """Detect if any changes were made and enable/disable save button"""
-        # Get current state
-        current_keys = self.keybinding.get('keys', [])
-        current_question = self.question_template.toPlainText()
-        current_answer = self.answer_template.toPlainText()
-
-        # Compare with initial state
-        has_changes = (
-            current_keys != self._initial_state['keys'] or
-            current_question != self._initial_state['question_template'] or
-            current_answer != self._initial_state['answer_template']
-        )
-
-        # Enable/disable save button
-        self.save_btn.setEnabled(has_changes)
-        self._update_save_button_style()
+    def _mark_dirty(self):
+        """Enable the save button on the first change"""
+        if not self._dirty:
+            self._dirty = True
+            self.save_btn.setEnabled(True)
+            self._update_save_button_style()
 
     def _update_key_display(self):
         """Update the key display button appearance"""
-        from .utils import format_keys_verbose
-
-        c = ThemeManager.get_palette()
+        qss = _get_stylesheets(ThemeManager.current_theme_id())
         keys = self.keybinding.get("keys", [])
         if self.recording_keys:
             text = "Press any key combination..."
-            style = f"""
-                QPushButton {{
-                    background: {c['surface']};
-                    color: {c['accent']};
-                    border: 2px solid {c['accent']};
-                    border-radius: 8px;
-                    font-size: 14px;
-                    font-weight: 500;
-                }}
-            """
+            style = qss["key_recording"]
         elif keys:
             # Display keycaps
-            text = format_keys_verbose(keys)
-            style = f"""
-                QPushButton {{
-                    background: {c['surface']};
-                    color: {c['text']};
-                    border: 1px solid {c['border']};
-                    border-radius: 8px;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    border-color: {c['text_secondary']};
-                }}
-            """
+            text = format_keys_verbose(tuple(keys))
+            style = qss["key_set"]
         else:
             text = "Click to set shortcut"
-            style = f"""
-                QPushButton {{
-                    background: {c['surface']};
-                    color: {c['text_secondary']};
-                    border: 1px dashed {c['border']};
-                    border-radius: 8px;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    border-color: {c['text_secondary']};
-                }}
-            """
+            style = qss["key_empty"]
 
         self.key_display.setText(text)
         self.key_display.setStyleSheet(style)
@@ -332,9 +318,8 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
     def _update_recording_display(self, keys):
         """Called by KeyRecorderMixin during recording to update the display"""
         # Update the display to show current keys being recorded
-        from .utils import format_keys_verbose
         if keys:
-            self.key_display.setText(format_keys_verbose(keys))
+            self.key_display.setText(format_keys_verbose(tuple(keys)))
         else:
             self.key_display.setText("Press any key combination...")
 
@@ -344,7 +329,8 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
             # Keep the original order (don't sort)
             self.keybinding["keys"] = keys
         self._update_key_display()
-        self._on_change()  # Check if changes were made
+        if tuple(self.keybinding.get('keys', ())) != self._initial_keys:
+            self._mark_dirty()
 
     def discard_and_go_back(self):
         """Discard changes and return to list view without saving"""
@@ -372,31 +358,26 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
         keybindings = config.get("keybindings", [])
         current_keys = self.keybinding.get("keys", [])
 
-        for i, kb in enumerate(keybindings):
-            # Skip the current keybinding if we're editing
-            if self.index is not None and i == self.index:
-                continue
-
-            # Check if keys match
-            existing_keys = kb.get("keys", [])
-            if existing_keys == current_keys:
-                tooltip("This key combination is already in use by another shortcut")
-                return
+        # Keys of every other keybinding (the one being edited is skipped)
+        existing_keys = {tuple(kb.get("keys", [])) for i, kb in enumerate(keybindings) if i != self.index}
+        if tuple(current_keys) in existing_keys:
+            tooltip("This key combination is already in use by another shortcut")
+            return
 
         # Save
         self.keybinding["question_template"] = question_template
         self.keybinding["answer_template"] = answer_template
 
+        # Nothing changed (e.g. an edit that was undone): skip the write and
+        # the panel's JavaScript refresh
+        if self.index is not None and self.index < len(keybindings) and keybindings[self.index] == self.keybinding:
+            self.discard_and_go_back()
+            return
+
         # Update config
         if self.index is None:
             # New keybinding
             keybindings.append(self.keybinding)
-            # Track template addition in analytics
-            try:
-                from .analytics import track_template_added
-                track_template_added()
-            except:
-                pass
         else:
             # Edit existing
             keybindings[self.index] = self.keybinding
@@ -404,6 +385,16 @@ class SettingsEditorView(KeyRecorderMixin, QWidget):
         config["keybindings"] = keybindings
         mw.addonManager.writeConfig(ADDON_NAME, config)
 
+        # Track template addition in analytics. This reads and writes the
+        # config itself, so it must run after the write above or that write
+        # would overwrite the new count with the copy read before it.
+        if self.index is None:
+            try:
+                from .analytics import track_template_added
+                track_template_added()
+            except:
+                pass
+
         # Refresh JavaScript in panel
         self._refresh_panel_javascript()
 
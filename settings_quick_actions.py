@@ -2,13 +2,14 @@
 Settings Quick Actions View - Configure keyboard shortcuts for highlight actions.
 """
 
+import json
 import sys
 from aqt import mw
 from aqt.utils import tooltip
 
 # Addon name for config storage (must match folder name, not __name__)
 from aqt.utils import tooltip
-from .utils import ADDON_NAME
+from .utils import ADDON_NAME, format_keys_verbose, format_shortcut_display
 from .theme_manager import ThemeManager
 
 try:
@@ -21,6 +22,7 @@ except ImportError:
     from PyQt5.QtGui import QCursor
 
 from .key_recorder import KeyRecorderMixin
+from .reviewer_highlight import invalidate_config_cache
 
 
 class QuickActionsSettingsView(KeyRecorderMixin, QWidget):
@@ -143,14 +145,12 @@ class QuickActionsSettingsView(KeyRecorderMixin, QWidget):
 
     def _update_shortcut_display(self, button, keys):
         """Update a shortcut display button with current keys"""
-        from .utils import format_keys_verbose
-
         c = ThemeManager.get_palette()
         
         if self.recording_target:
             # During recording - no hover state to avoid bright blue
             if keys:
-                display_text = format_keys_verbose(keys)
+                display_text = format_keys_verbose(tuple(keys))
                 button.setText(display_text)
             else:
                 button.setText("Press any key combination...")
@@ -168,7 +168,7 @@ class QuickActionsSettingsView(KeyRecorderMixin, QWidget):
         else:
             # Normal state
             if keys:
-                display_text = format_keys_verbose(keys)
+                display_text = format_keys_verbose(tuple(keys))
                 button.setText(display_text)
             else:
                 button.setText("Click to record shortcut")
@@ -274,6 +274,7 @@ class QuickActionsSettingsView(KeyRecorderMixin, QWidget):
         config = mw.addonManager.getConfig(ADDON_NAME)
         config["quick_actions"] = self.shortcuts
         mw.addonManager.writeConfig(ADDON_NAME, config)
+        invalidate_config_cache()
 
         # Update the JavaScript config in the reviewer immediately
         self._update_reviewer_config()
@@ -300,24 +301,8 @@ class QuickActionsSettingsView(KeyRecorderMixin, QWidget):
         add_to_chat_keys = quick_actions["add_to_chat"]["keys"]
         ask_question_keys = quick_actions["ask_question"]["keys"]
 
-        # Create display text (e.g., "⌘F" or "Ctrl+Shift+F")
-        def format_shortcut_display(keys):
-            display_keys = []
-            for key in keys:
-                if key == "Meta":
-                    display_keys.append("⌘")
-                elif key == "Control":
-                    display_keys.append("Ctrl")
-                elif key == "Shift":
-                    display_keys.append("Shift")
-                elif key == "Alt":
-                    display_keys.append("Alt")
-                else:
-                    display_keys.append(key)
-            return "".join(display_keys) if "⌘" in display_keys else "+".join(display_keys)
-
-        add_to_chat_display = format_shortcut_display(add_to_chat_keys)
-        ask_question_display = format_shortcut_display(ask_question_keys)
+        add_to_chat_display = format_shortcut_display(tuple(add_to_chat_keys))
+        ask_question_display = format_shortcut_display(tuple(ask_question_keys))
 
         # Create JavaScript to update the config
         js_code = f"""
@@ -328,12 +313,12 @@ class QuickActionsSettingsView(KeyRecorderMixin, QWidget):
             }}
             
             window.quickActionsConfig.addToChat = {{
-                keys: {add_to_chat_keys},
-                display: "{add_to_chat_display}"
+                keys: {json.dumps(add_to_chat_keys)},
+                display: {json.dumps(add_to_chat_display)}
             }};
             window.quickActionsConfig.askQuestion = {{
-                keys: {ask_question_keys},
-                display: "{ask_question_display}"
+                keys: {json.dumps(ask_question_keys)},
+                display: {json.dumps(ask_question_display)}
             }};
             
             // If bubble is visible, update the display text in the buttons
@@ -342,10 +327,10 @@ class QuickActionsSettingsView(KeyRecorderMixin, QWidget):
                 var addToChatSpan = bubble.querySelector('#add-to-chat-btn span:last-child');
                 var askQuestionSpan = bubble.querySelector('#ask-question-btn span:last-child');
                 if (addToChatSpan) {{
-                    addToChatSpan.textContent = '{add_to_chat_display}';
+                    addToChatSpan.textContent = {json.dumps(add_to_chat_display)};
                 }}
                 if (askQuestionSpan) {{
-                    askQuestionSpan.textContent = '{ask_question_display}';
+                    askQuestionSpan.textContent = {json.dumps(ask_question_display)};
                 }}
             }}
             
@@ -15,6 +15,11 @@ class ThemeManager:
             return mw.pm.night_mode()
         return False  # Default to light mode if determining fails
 
+    @classmethod
+    def current_theme_id(cls):
+        """Get an identifier for the current mode ("dark" or "light")."""
+        return "dark" if cls.is_night_mode() else "light"
+
     @classmethod
     def get_palette(cls):
         """Get the color palette for current mode."""
@@ -4,6 +4,7 @@ Utility functions for AI Side Panel add-on.
 
 import re
 import os
+from functools import lru_cache
 
 # Addon name for config storage (dynamically detected from folder name)
 ADDON_NAME = os.path.basename(os.path.dirname(__file__))
@@ -58,8 +59,20 @@ def format_keys_display(keys):
     return " + ".join(keycaps)
 
 
+# Modifier labels used by format_shortcut_display; other keys show as-is
+_SHORTCUT_SYMBOLS = {"Meta": "⌘", "Control": "Ctrl"}
+
+
+@lru_cache(maxsize=32)
+def format_shortcut_display(keys):
+    """Format a key tuple as compact shortcut text (e.g., "⌘F" or "Ctrl+Shift+F")"""
+    display_keys = [_SHORTCUT_SYMBOLS.get(key, key) for key in keys]
+    return "".join(display_keys) if "⌘" in display_keys else "+".join(display_keys)
+
+
+@lru_cache(maxsize=128)
 def format_keys_verbose(keys):
-    """Format keys with verbose display (e.g., '⌘ Cmd + ⇧ Shift')"""
+    """Format a key tuple with verbose display (e.g., '⌘ Cmd + ⇧ Shift')"""
     import sys
     display_keys = []
     for key in keys:
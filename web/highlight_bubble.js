@@ -0,0 +1,935 @@
+(function() {
+    // Only inject once
+    if (window.ankiHighlightBubbleInjected) {
+        return;
+    }
+    window.ankiHighlightBubbleInjected = true;
+    console.log('Anki: Injecting highlight bubble for OpenEvidence');
+
+    const IS_MAC = navigator.platform.toUpperCase().indexOf('MAC') >= 0;
+
+    // Tutorial events are best-effort: skip them where pycmd isn't defined
+    function sendTutorialEvent(name) {
+        if (typeof pycmd === 'function') {
+            pycmd('openevidence:tutorial_event:' + name);
+        }
+    }
+
+    let bubble = null;
+    let currentState = 'default'; // 'default' or 'input'
+    let selectedText = '';
+    let contextText = ''; // Store context text for the pill
+    let pendingRaf = 0; // Selection check scheduled for the next frame
+    // Last selection the bubble was shown for, to skip identical re-shows
+    let lastText = '';
+    let lastRectX = 0;
+    let lastRectY = 0;
+    // Bubble position last written by moveBubble, in page coordinates
+    let bubbleX = 0;
+    let bubbleY = 0;
+
+    // Bubble styles, injected once in createBubble. Hover colors live here
+    // too so crossing a button runs no JS.
+    const BUBBLE_CSS = `
+        #anki-highlight-bubble {
+            position: absolute;
+            left: 0;
+            top: 0;
+            will-change: transform;
+            contain: layout style paint;
+            background: var(--oa-background);
+            border-radius: 6px;
+            border: 1px solid var(--oa-border);
+            padding: 4px;
+            z-index: 9999;
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+            font-size: 12px;
+            color: var(--oa-text);
+            line-height: 1;
+            min-height: auto;
+            overflow: hidden;
+        }
+        #anki-highlight-bubble button {
+            border: none;
+            box-shadow: none;
+            cursor: pointer;
+        }
+        #default-panel {
+            display: flex;
+            align-items: center;
+            gap: 1px;
+            line-height: 1;
+            margin: 0;
+            padding: 0;
+        }
+        #add-to-chat-btn, #ask-question-btn {
+            background: transparent;
+            color: var(--oa-text);
+            padding: 2px 8px;
+            border-radius: 3px;
+            font-size: 12px;
+            font-weight: 500;
+            transition: all 0.15s ease;
+            white-space: nowrap;
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            display: inline-flex;
+            align-items: center;
+            gap: 6px;
+            line-height: 1;
+            margin: 0;
+        }
+        #add-to-chat-btn:hover, #ask-question-btn:hover { background-color: var(--oa-hover); }
+        #anki-highlight-bubble .shortcut {
+            font-size: 10px;
+            color: var(--oa-text-secondary);
+            font-weight: 400;
+        }
+        #anki-highlight-bubble .divider {
+            width: 1px;
+            height: 14px;
+            background-color: var(--oa-border);
+            margin: 0;
+        }
+        #input-panel {
+            display: flex;
+            flex-direction: column;
+            padding: 0px;
+            gap: 0px;
+            min-width: 280px;
+            max-width: 380px;
+            position: relative;
+        }
+        #input-panel .input-row {
+            display: flex;
+            align-items: flex-start;
+            gap: 4px;
+            padding: 7px 6px 6px 8px;
+        }
+        #input-panel .actions-row {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin: 0;
+            padding: 0 6px 6px 8px;
+        }
+        #question-input {
+            background: transparent;
+            border: none;
+            color: var(--oa-text);
+            padding: 0;
+            font-size: 13px;
+            font-weight: 500;
+            outline: none;
+            flex: 1;
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            resize: none;
+            overflow-y: auto;
+            min-height: 10px;
+            max-height: 100px;
+            line-height: 1.3;
+            word-wrap: break-word;
+            margin: 0;
+        }
+        #close-btn {
+            appearance: none;
+            -webkit-appearance: none;
+            background: transparent;
+            outline: none;
+            color: var(--oa-text-secondary);
+            font-size: 13px;
+            padding: 0;
+            width: 18px;
+            height: 18px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            transition: all 0.15s ease;
+            line-height: 1;
+            flex-shrink: 0;
+            margin: 0;
+            margin-left: auto;
+            margin-right: -1px;
+            border-radius: 0;
+        }
+        #close-btn:hover { color: var(--oa-text); }
+        #context-pill {
+            display: flex;
+            align-items: center;
+            gap: 6px;
+            background: var(--oa-hover);
+            border: 1px dashed var(--oa-border);
+            border-radius: 12px;
+            padding: 2px 8px;
+            height: 20px;
+            box-sizing: border-box;
+            font-size: 10px;
+            color: var(--oa-text-secondary);
+            cursor: pointer;
+            transition: all 0.15s ease;
+            max-width: 180px;
+            white-space: nowrap;
+            overflow: hidden;
+        }
+        #context-label {
+            display: flex;
+            min-width: 0;
+            max-width: 90px;
+            line-height: 1.2;
+        }
+        #context-text {
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+        #context-clear {
+            display: none;
+            background: transparent;
+            color: inherit;
+            font-size: 10px;
+            padding: 0;
+            width: 10px;
+            height: 10px;
+            flex-shrink: 0;
+            line-height: 1;
+            opacity: 0.7;
+        }
+        /* Selection attached: accent glow (kept semi-transparent, which is
+           hard to do with the theme vars unless we split RGB) */
+        #context-pill.ctx-pill-active {
+            border-style: solid;
+            border-color: rgba(59, 130, 246, 0.6);
+            color: var(--oa-text);
+            background: rgba(59, 130, 246, 0.1);
+            box-shadow: 0 0 8px rgba(59, 130, 246, 0.4);
+        }
+        #context-pill.ctx-pill-active #context-clear { display: block; }
+        /* Quotes sit outside the clipped text so the ellipsis never hides them */
+        #context-pill.ctx-pill-active #context-label::before,
+        #context-pill.ctx-pill-active #context-label::after {
+            content: '"';
+            flex-shrink: 0;
+        }
+        #submit-btn {
+            background: var(--oa-accent);
+            color: #ffffff;
+            padding: 0;
+            border-radius: 50%;
+            font-size: 13px;
+            font-weight: 600;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            transition: all 0.15s ease;
+            width: 19px;
+            height: 19px;
+            flex-shrink: 0;
+            margin: 0;
+        }
+        #submit-btn:hover { background-color: var(--oa-accent-hover); }
+    `;
+
+    // Bubble markup for each state, parsed once in createBubble; per-card
+    // values (the shortcut labels) are filled in when rendering
+    const DEFAULT_HTML = `
+        <div id="default-panel">
+            <button id="add-to-chat-btn">
+                <span>Add to Chat</span>
+                <span id="add-to-chat-shortcut" class="shortcut"></span>
+            </button>
+            <div class="divider"></div>
+            <button id="ask-question-btn">
+                <span>Ask Question</span>
+                <span id="ask-question-shortcut" class="shortcut"></span>
+            </button>
+        </div>
+    `;
+
+    const INPUT_HTML = `
+        <div id="input-panel">
+            <div class="input-row">
+                <textarea id="question-input" placeholder="Ask a question..." rows="1"></textarea>
+                <button id="close-btn">✕</button>
+            </div>
+            <div class="actions-row">
+                <div id="context-pill">
+                    <span id="context-label"><span id="context-text">Select text +</span></span>
+                    <button id="context-clear">✕</button>
+                </div>
+                <button id="submit-btn"><svg width="10" height="11" viewBox="0 0 10 11" fill="none" xmlns="http://www.w3.org/2000/svg"><path d="M5 1.5V9.5M5 1.5L2 4.5M5 1.5L8 4.5" stroke="currentColor" stroke-width="1.5" stroke-linecap="round" stroke-linejoin="round"/></svg></button>
+            </div>
+        </div>
+    `;
+
+    // Shortcuts are matched as a modifier bitmask plus one regular key.
+    // 'Control/Meta' is what non-Mac platforms report for either key.
+    const MODIFIER_BITS = {'Shift': 1, 'Alt': 2, 'Control': 4, 'Meta': 8, 'Control/Meta': 16};
+
+    // Compile a configured key list to {mask, key, hasControl}, or null if it
+    // can never match (empty, repeated modifiers, or several regular keys)
+    function compileShortcut(keys) {
+        if (!keys || keys.length === 0) return null;
+        var mask = 0;
+        var key = null;
+        for (var i = 0; i < keys.length; i++) {
+            var bit = MODIFIER_BITS[keys[i]];
+            if (bit) {
+                if (mask & bit) return null;
+                mask |= bit;
+            } else if (key === null) {
+                key = keys[i];
+            } else {
+                return null;
+            }
+        }
+        return {mask: mask, key: key, hasControl: keys.indexOf('Control') !== -1};
+    }
+
+    const DEFAULT_ASK_SHORTCUT = compileShortcut(['Meta', 'R']);
+    const DEFAULT_CHAT_SHORTCUT = compileShortcut(['Meta', 'F']);
+
+    // Compiled form of a quickActionsConfig entry. The config is re-sent with
+    // each card, so the result is cached on the entry object itself.
+    function compiledShortcut(entry, fallback) {
+        if (!entry || !entry.keys) return fallback;
+        if (entry.compiled === undefined) {
+            entry.compiled = compileShortcut(entry.keys);
+        }
+        return entry.compiled;
+    }
+
+    // A-Z or 0-9
+    function isUpperAlnum(cc) {
+        return (cc >= 48 && cc <= 57) || (cc >= 65 && cc <= 90);
+    }
+
+    // Read the pressed modifiers and regular key from a keydown once
+    function readPressedKeys(e) {
+        var mask = 0;
+
+        if (e.shiftKey) mask |= MODIFIER_BITS['Shift'];
+        if (e.altKey) mask |= MODIFIER_BITS['Alt'];
+
+        if (IS_MAC) {
+            if (e.ctrlKey) mask |= MODIFIER_BITS['Control'];
+            if (e.metaKey) mask |= MODIFIER_BITS['Meta'];
+        } else {
+            if (e.ctrlKey || e.metaKey) mask |= MODIFIER_BITS['Control/Meta'];
+        }
+
+        // Get the regular key - try multiple methods for reliability
+        // On macOS, Control+T might give e.key as "Tab" (browser shortcut) but e.code as "KeyT"
+        // (char code checks rather than regexes: no match arrays per keystroke)
+        var regularKey = null;
+
+        // First try e.key if it's a single letter or digit
+        var key = e.key;
+        if (key && key.length === 1) {
+            var cc = key.charCodeAt(0);
+            if (isUpperAlnum(cc)) {
+                regularKey = key;
+            } else if (cc >= 97 && cc <= 122) {
+                regularKey = String.fromCharCode(cc - 32);
+            }
+        }
+        // Fallback to e.code for more reliable detection (especially for Control combinations)
+        if (regularKey === null && e.code) {
+            // Match patterns like "KeyT", "KeyA", "Digit1", etc.
+            var code = e.code;
+            var last = code.length - 1;
+            if ((code.length === 4 && code.startsWith('Key')) ||
+                    (code.length === 6 && code.startsWith('Digit'))) {
+                if (isUpperAlnum(code.charCodeAt(last))) {
+                    regularKey = code.charAt(last);
+                }
+            }
+        }
+
+        return {mask: mask, key: regularKey};
+    }
+
+    // Exact match: same modifiers and the same regular key (or none)
+    function checkShortcut(pressed, shortcut) {
+        return shortcut !== null && pressed.mask === shortcut.mask && pressed.key === shortcut.key;
+    }
+
+    // Handle shortcut actions
+    function handleAskQuestion(e) {
+        e.preventDefault();
+        e.stopImmediatePropagation();  // More aggressive than stopPropagation
+        
+        const selection = window.getSelection();
+        const text = selection.toString().trim();
+        
+        if (text && text.length > 0) {
+            selectedText = text;
+            const range = selection.getRangeAt(0);
+            const rect = range.getBoundingClientRect();
+            renderInputState();
+            placeBubble(rect);
+            
+            // Notify tutorial that shortcut was used
+            sendTutorialEvent('shortcut_used');
+        } else if (currentState === 'default' || !isBubbleVisible()) {
+            selectedText = '';
+            const centerRect = {
+                left: window.innerWidth / 2,
+                right: window.innerWidth / 2,
+                top: window.innerHeight / 3,
+                bottom: window.innerHeight / 3,
+                width: 0,
+                height: 0
+            };
+            renderInputState();
+            placeBubble(centerRect);
+        }
+    }
+
+    function handleAddToChatShortcut(e) {
+        e.preventDefault();
+        e.stopImmediatePropagation();  // More aggressive than stopPropagation
+        
+        const selection = window.getSelection();
+        const text = selection.toString().trim();
+        
+        if (text && text.length > 0) {
+            selectedText = text;
+            handleAddToChat();  // Call the actual handler function
+            
+            // Notify tutorial that shortcut was used
+            sendTutorialEvent('shortcut_used');
+        }
+    }
+
+    // Main keyboard shortcut handler - completely rewritten
+    // Use capture phase with highest priority on window (not document)
+    window.addEventListener('keydown', function(e) {
+        // Typing a question into the bubble never triggers the shortcuts
+        if (e.target && e.target.id === 'question-input') return;
+
+        // Get shortcuts from config
+        var config = window.quickActionsConfig || {};
+        var askShortcut = compiledShortcut(config.askQuestion, DEFAULT_ASK_SHORTCUT);
+        var chatShortcut = compiledShortcut(config.addToChat, DEFAULT_CHAT_SHORTCUT);
+
+        // Without any modifier held only a modifier-less shortcut could match
+        if (!(e.ctrlKey || e.metaKey || e.altKey || e.shiftKey) &&
+                !(askShortcut && askShortcut.mask === 0) &&
+                !(chatShortcut && chatShortcut.mask === 0)) {
+            return;
+        }
+
+        // Early check: if Control key is pressed and it's part of our shortcuts, prevent default immediately
+        var hasControl = IS_MAC ? e.ctrlKey : (e.ctrlKey || e.metaKey);
+        
+        if (hasControl) {
+            // Check if this Control combination matches any of our shortcuts
+            var askHasControl = askShortcut !== null && askShortcut.hasControl;
+            var chatHasControl = chatShortcut !== null && chatShortcut.hasControl;
+
+            if (askHasControl || chatHasControl) {
+                // Prevent default early for Control combinations to stop browser shortcuts
+                e.preventDefault();
+            }
+        }
+
+        var pressed = readPressedKeys(e);
+
+        var askMatch = checkShortcut(pressed, askShortcut);
+        var chatMatch = checkShortcut(pressed, chatShortcut);
+
+        // Debug logging (set window.quickActionsDebug = true to enable)
+        if (window.quickActionsDebug) {
+            console.log('Quick Actions keydown:', e.code, askMatch, chatMatch);
+        }
+
+        // Check Ask Question shortcut
+        if (askMatch) {
+            console.log('Ask Question match!');
+            handleAskQuestion(e);
+            return false;  // Return false as additional prevention
+        }
+
+        // Check Add to Chat shortcut
+        if (chatMatch) {
+            console.log('Add to Chat match!');
+            handleAddToChatShortcut(e);
+            return false;  // Return false as additional prevention
+        }
+    }, true);  // Capture phase - intercept before anyone else
+
+    // Create the bubble element. Both state panels are built here once;
+    // rendering a state only toggles which panel is visible.
+    function createBubble() {
+        // Stylesheet first, so the bubble is matched against it on insertion
+        if (!document.getElementById('anki-hl-bubble-css')) {
+            const style = document.createElement('style');
+            style.id = 'anki-hl-bubble-css';
+            style.textContent = BUBBLE_CSS;
+            document.head.appendChild(style);
+        }
+
+        const div = document.createElement('div');
+        div.id = 'anki-highlight-bubble';
+        div.style.display = 'none';
+        div.innerHTML = DEFAULT_HTML + INPUT_HTML;
+
+        // Look up the elements the renders touch once and keep them on the bubble
+        div._defaultPanel = div.querySelector('#default-panel');
+        div._inputPanel = div.querySelector('#input-panel');
+        div._addShortcut = div.querySelector('#add-to-chat-shortcut');
+        div._askShortcut = div.querySelector('#ask-question-shortcut');
+        div._input = div.querySelector('#question-input');
+        div._contextPill = div.querySelector('#context-pill');
+        div._contextText = div.querySelector('#context-text');
+
+        div._inputPanel.style.display = 'none';
+        document.body.appendChild(div);
+
+        // One delegated click handler for the buttons of both states and
+        // the context pill
+        div.addEventListener('click', (e) => {
+            const btn = e.target.closest('button');
+            if (!btn) {
+                if (e.target.closest('#context-pill')) {
+                    e.stopPropagation();
+                    showContextHint();
+                }
+                return;
+            }
+            e.stopPropagation();
+            switch (btn.id) {
+                case 'add-to-chat-btn':
+                    handleAddToChat();
+                    break;
+                case 'ask-question-btn':
+                    renderInputState();
+                    break;
+                case 'submit-btn':
+                    handleSubmitQuestion();
+                    break;
+                case 'close-btn':
+                    hideBubble();
+                    break;
+                case 'context-clear':
+                    clearContext();
+                    break;
+            }
+        });
+
+        // Prevent button presses from bubbling to document level
+        const stopButtonPress = (e) => {
+            if (e.target.closest('button')) {
+                e.stopPropagation();
+            }
+        };
+        div.addEventListener('pointerup', stopButtonPress, { passive: true });
+        div.addEventListener('pointerdown', stopButtonPress, { passive: true });
+
+        // Drags start from presses on the bubble itself. A hidden
+        // (display: none) bubble receives no pointer events, so presses
+        // elsewhere on the card never reach this.
+        div.addEventListener('pointerdown', startDrag);
+        // A cancelled or otherwise interrupted drag never sees the
+        // document pointerup; losing capture (also fired after
+        // pointercancel) ends it instead
+        div.addEventListener('lostpointercapture', stopDrag);
+
+        const input = div._input;
+        const contextTextSpan = div._contextText;
+
+        // Auto-resize textarea as user types, at most once per frame. The
+        // height only has to be reset to 'auto' (a forced reflow) when text
+        // was removed; growth shows up in scrollHeight directly.
+        let resizeRaf = 0;
+        input.addEventListener('input', () => {
+            if (resizeRaf) return;
+            resizeRaf = requestAnimationFrame(() => {
+                resizeRaf = 0;
+                const length = input.value.length;
+                const shrank = length < input._lastLength;
+                input._lastLength = length;
+                if (shrank) {
+                    input.style.height = 'auto';
+                }
+                const height = Math.min(input.scrollHeight, 100) + 'px';
+                if (shrank || height !== input._lastHeight) {
+                    input.style.height = height;
+                    input._lastHeight = height;
+                }
+            });
+        });
+
+        // Submit on Enter key (without Shift)
+        input.addEventListener('keydown', (e) => {
+            if (e.key === 'Enter' && !e.shiftKey) {
+                e.preventDefault();
+                handleSubmitQuestion();
+            }
+        });
+
+        // Context pill click (State A: show hint)
+        function showContextHint() {
+            if (!contextText) {
+                const originalText = contextTextSpan.textContent;
+                contextTextSpan.textContent = 'Highlight text on page';
+                setTimeout(() => {
+                    if (!contextText) {
+                        contextTextSpan.textContent = originalText;
+                    }
+                }, 1500);
+            }
+        }
+        return div;
+    }
+
+    // Update context pill based on contextText. State A (empty) is the
+    // base #context-pill style; State B (selection) adds ctx-pill-active,
+    // which also reveals the clear button. Unchanged text or state is not
+    // rewritten.
+    function updateContextPill() {
+        const contextPill = bubble._contextPill;
+        const active = !!contextText;
+
+        // Quotes and the ellipsis are drawn by CSS (#context-label)
+        const label = active ? contextText : 'Select text +';
+        if (bubble._contextLabel !== label) {
+            bubble._contextText.textContent = label;
+            bubble._contextLabel = label;
+        }
+
+        const state = active ? 'active' : 'empty';
+        if (contextPill.dataset.state !== state) {
+            contextPill.dataset.state = state;
+            contextPill.classList.toggle('ctx-pill-active', active);
+        }
+    }
+
+    // Clear context
+    function clearContext() {
+        contextText = '';
+        updateContextPill();
+    }
+
+    // The bubble is only built the first time it is shown, so cards that
+    // are just read and flipped never create it
+    function ensureBubble() {
+        if (!bubble) {
+            bubble = createBubble();
+        }
+    }
+
+    function isBubbleVisible() {
+        return bubble !== null && bubble.style.display !== 'none';
+    }
+
+    // Render default state with two buttons and divider
+    function renderDefaultState() {
+        ensureBubble();
+        currentState = 'default';
+        // Remove shadow for the buttons bar (flat look)
+        bubble.style.boxShadow = 'none';
+
+        bubble._addShortcut.textContent =
+            window.quickActionsConfig?.addToChat?.display || '⌘F';
+        bubble._askShortcut.textContent =
+            window.quickActionsConfig?.askQuestion?.display || '⌘R';
+
+        bubble._inputPanel.style.display = 'none';
+        bubble._defaultPanel.style.display = 'flex';
+    }
+
+    function renderInputState() {
+        ensureBubble();
+        currentState = 'input';
+        // Add shadow back for the input bubble so it stands out
+        bubble.style.boxShadow = '0 4px 12px var(--oa-shadow)';
+
+        // The panel is reused, so reset what the last question left behind
+        const input = bubble._input;
+        input.value = '';
+        input.style.height = '';
+        input._lastLength = 0;
+        input._lastHeight = '';
+
+        bubble._defaultPanel.style.display = 'none';
+        bubble._inputPanel.style.display = 'flex';
+
+        // Focus the input
+        setTimeout(() => input.focus(), 0);
+
+        // Initialize context with selectedText if available
+        if (selectedText && !contextText) {
+            contextText = selectedText;
+        }
+
+        // Initialize context pill
+        updateContextPill();
+    }
+
+    // Handle "Add to Chat" action
+    function handleAddToChat() {
+        console.log('Anki: Add to Chat clicked, text:', selectedText);
+        // Send message to Python
+        pycmd('openevidence:' + JSON.stringify({op: 'add_context', text: selectedText}));
+        hideBubble();
+    }
+
+    // Handle question submission
+    function handleSubmitQuestion() {
+        const input = bubble._input;
+        const query = input.value.trim();
+
+        if (query) {
+            // Use contextText if available, otherwise use selectedText
+            const finalContext = contextText || selectedText;
+            console.log('Anki: Question submitted:', query, 'Context:', finalContext);
+            // Send message to Python as a JSON envelope
+            pycmd('openevidence:' + JSON.stringify({op: 'ask_query', query: query, context: finalContext}));
+            hideBubble();
+            // Clear context after submission
+            contextText = '';
+        }
+    }
+
+    // Move the bubble with a compositor-only transform so repositioning
+    // doesn't reflow the card underneath
+    function moveBubble(x, y) {
+        bubbleX = x;
+        bubbleY = y;
+        bubble.style.transform = 'translate3d(' + x + 'px,' + y + 'px,0)';
+    }
+
+    // Position the bubble above or below the selection
+    function positionBubble(rect) {
+        // One measurement for both dimensions (translation doesn't affect size)
+        const bubbleRect = bubble.getBoundingClientRect();
+        const bubbleHeight = bubbleRect.height;
+        const bubbleWidth = bubbleRect.width;
+        const padding = 20; // Vertical padding between selection and bubble
+
+        // Position horizontally based on the end (right edge) of the selection
+        // Align bubble's right edge near the selection's right edge
+        let left = rect.right - bubbleWidth;
+
+        // Keep bubble within viewport horizontal bounds with some margin
+        const margin = 10;
+        if (left < margin) {
+            left = margin;
+        }
+        if (left + bubbleWidth > window.innerWidth - margin) {
+            left = window.innerWidth - bubbleWidth - margin;
+        }
+
+        // Default: Position below the selection
+        let top = rect.bottom + padding;
+
+        // Check: Would it go off the bottom of the screen?
+        if (top + bubbleHeight > window.innerHeight) {
+            // Flip: Position above the selection instead
+            top = rect.top - bubbleHeight - padding;
+        }
+
+        moveBubble(left + window.scrollX, top + window.scrollY);
+    }
+
+    // Lay the bubble out invisibly, then measure and place it in one frame
+    // so the size reads and the position write don't interleave
+    function placeBubble(rect) {
+        bubble.style.visibility = 'hidden';
+        bubble.style.display = 'block';
+        requestAnimationFrame(() => {
+            positionBubble(rect);
+            bubble.style.visibility = 'visible';
+            // focus() is a no-op while the bubble is hidden
+            if (currentState === 'input') {
+                bubble._input.focus();
+            }
+        });
+    }
+
+    // Show the bubble
+    function showBubble(rect, text) {
+        selectedText = text;
+        renderDefaultState();
+        placeBubble(rect);
+        
+        // Notify tutorial that text was highlighted (Quick Action bar is showing)
+        sendTutorialEvent('text_highlighted');
+    }
+
+    // Hide the bubble
+    function hideBubble() {
+        if (bubble) {
+            bubble.style.display = 'none';
+        }
+        currentState = 'default';
+        contextText = ''; // Clear context when bubble is hidden
+    }
+
+    // Drag functionality
+    let isDragging = false;
+    let dragOffsetX = 0;
+    let dragOffsetY = 0;
+    // Latest drag target, written to the bubble at most once per frame
+    let pendingX = 0;
+    let pendingY = 0;
+    let dragRaf = 0;
+
+    function startDrag(e) {
+        // Don't start drag on buttons, inputs, textareas, or the context
+        // pill: pointer capture would retarget their click to the bubble
+        if (e.target.closest('button, input, textarea, #context-pill')) {
+            return;
+        }
+
+        isDragging = true;
+        // The bubble's position is whatever moveBubble last wrote, so the
+        // grab offset needs no layout read
+        dragOffsetX = e.pageX - bubbleX;
+        dragOffsetY = e.pageY - bubbleY;
+        bubble.style.cursor = 'grabbing';
+        // Cancelling pointerdown doesn't stop text selection, so turn it
+        // off for the duration of the drag
+        document.body.style.userSelect = 'none';
+        e.preventDefault();
+
+        // Only listen for moves while dragging. Capturing the pointer keeps
+        // the moves and the final pointerup coming even if the pointer
+        // ends up over a bubble button.
+        bubble.setPointerCapture(e.pointerId);
+        document.addEventListener('pointermove', drag, { passive: true });
+    }
+
+    function drag(e) {
+        if (!isDragging) return;
+
+        pendingX = e.pageX - dragOffsetX;
+        pendingY = e.pageY - dragOffsetY;
+
+        if (dragRaf) return;
+        dragRaf = requestAnimationFrame(() => {
+            dragRaf = 0;
+            moveBubble(pendingX, pendingY);
+        });
+    }
+
+    function stopDrag() {
+        if (isDragging) {
+            isDragging = false;
+            document.removeEventListener('pointermove', drag);
+            // Land on the last pointer position even if its frame hasn't run
+            if (dragRaf) {
+                cancelAnimationFrame(dragRaf);
+                dragRaf = 0;
+                moveBubble(pendingX, pendingY);
+            }
+            bubble.style.cursor = 'default';
+            document.body.style.userSelect = '';
+        }
+    }
+
+    // Pick up text selected on the card while the input bubble is open.
+    // selectionchange only fires when the selection actually changes, and
+    // collapsed selections (plain clicks, caret moves) are skipped before
+    // serializing anything. A drag-select fires it on every pointer move, so
+    // the selection is read at most once per frame.
+    let selectionRaf = 0;
+    document.addEventListener('selectionchange', () => {
+        if (currentState !== 'input' || selectionRaf) return;
+        selectionRaf = requestAnimationFrame(() => {
+            selectionRaf = 0;
+            if (currentState !== 'input') return;
+            const selection = window.getSelection();
+            if (!selection.rangeCount || selection.isCollapsed) return;
+            const text = selection.toString().trim();
+            if (text && text !== contextText) {
+                contextText = text;
+                updateContextPill();
+            }
+        });
+    }, { passive: true });
+
+    // Handle pointerup: ends a drag and opens the bubble for Cmd/Ctrl
+    // selections
+    document.addEventListener('pointerup', (e) => {
+        // The end of a drag is never a selection
+        if (isDragging) {
+            stopDrag();
+            return;
+        }
+
+        // Releases inside the bubble are its own clicks, not card selections
+        const visible = isBubbleVisible();
+        const inBubble = visible && bubble.contains(e.target);
+
+        // Fast path: without Command (Mac) or Control (Windows/Linux) held on
+        // a primary-button release the bubble never opens, so skip the frame
+        // callback and the selection read entirely
+        if (!(IS_MAC ? e.metaKey : e.ctrlKey) || e.button !== 0) {
+            if (currentState === 'default' && visible && !inBubble) {
+                hideBubble();
+            }
+            return;
+        }
+        if (inBubble) return;
+
+        // Read the selection on the next frame so it has completed; a burst
+        // of pointerups in one frame only checks it once
+        if (pendingRaf) return;
+        pendingRaf = requestAnimationFrame(() => {
+            pendingRaf = 0;
+            const selection = window.getSelection();
+            const text = selection.toString().trim();
+
+            // Only show bubble if text is selected
+            if (text && text.length > 0) {
+                // Get selection range
+                const range = selection.getRangeAt(0);
+
+                // Use the full selection rect but with the end position for horizontal alignment.
+                // A single-line selection has exactly one client rect, which is the full rect.
+                const rects = range.getClientRects();
+                const singleLine = rects.length === 1;
+                const rect = singleLine ? rects[0] : range.getBoundingClientRect();
+
+                // Same selection in the same place: the bubble is already showing it
+                if (text === lastText && rect.left === lastRectX && rect.top === lastRectY &&
+                        currentState === 'default' && isBubbleVisible()) {
+                    return;
+                }
+                lastText = text;
+                lastRectX = rect.left;
+                lastRectY = rect.top;
+
+                // For multi-line selections, measure the END position specifically;
+                // a single line already ends at its rect's right edge
+                let endRight = rect.right;
+                if (!singleLine) {
+                    const endRange = document.createRange();
+                    endRange.setStart(range.endContainer, range.endOffset);
+                    endRange.setEnd(range.endContainer, range.endOffset);
+                    endRight = endRange.getBoundingClientRect().right || rect.right;
+                }
+
+                const combinedRect = {
+                    left: rect.left,
+                    right: endRight,
+                    top: rect.top,
+                    bottom: rect.bottom,
+                    width: rect.width,
+                    height: rect.height
+                };
+
+                showBubble(combinedRect, text);
+            } else {
+                // No text selected - hide bubble if in default state and clicking outside
+                if (currentState === 'default' && isBubbleVisible()) {
+                    hideBubble();
+                }
+            }
+        });
+    }, { passive: true });
+
+    // Note: Bubble no longer auto-hides when clicking outside
+    // Only the X button in the input state can close the bubble
+})();